@@ -3,11 +3,22 @@ import time
 import board
 import neopixel
 import adafruit_adxl34x
+from ticks import ticks_ms
+from led_engine import LedEngine, Pulse, Flash
+from pickup_detector import PickupDetector
+
+STREAM_WAKE_G = 0.2   # chip activity threshold - only wakes the reads, the detector decides
+
+# Colours are perceptual levels; LedEngine's gamma table applies the brightness
+PICKUP_BLUE = (0, 0, 180)   # about the old (0, 0, 100) at 0.3 brightness
+GAME_OVER_RED = (255, 0, 0)
+PROGRESS_GREEN = (0, 160, 40)
 
 class AccelMonitor:
     """Monitor ADXL345 accelerometer and control NeoPixel based on pickup"""
     
-    def __init__(self, i2c, neopixel_pin=board.D10, num_pixels=1, brightness=0.3): #self,i2c-main.py, call itself
+    def __init__(self, i2c, neopixel_pin=board.D10, num_pixels=1, brightness=0.3, arbiter=None,
+                 streaming=False, int_pin=None, accel_device=None, sample_hz=20): #self,i2c-main.py, call itself
         """
         Initialize accelerometer and NeoPixel
         
@@ -16,65 +27,121 @@ class AccelMonitor:
             neopixel_pin: GPIO pin for NeoPixel (default: D10)
             num_pixels: Number of pixels in strip (default: 1)
             brightness: Brightness level 0.0-1.0 (default: 0.3)
+            arbiter: BusArbiter that rate-limits reads and yields to the display (optional)
+            streaming: Use the ADXL345 FIFO + activity interrupt instead of polling (default: False)
+            int_pin: DigitalInOut wired to ADXL345 INT1, lets polls between events skip the bus (optional)
+            accel_device: I2CDevice to use for streaming, e.g. adxl345_fake.FakeADXL345 (optional)
+            sample_hz: How often update() reads the sensor when polling (default: 20)
         """
         self.num_pixels = num_pixels
+        self.arbiter = arbiter
         
-        # Setup NeoPixel
+        # Setup NeoPixel - brightness lives in the LED engine's lookup table, so the
+        # driver doesn't rescale every write
         self.pixels = neopixel.NeoPixel(neopixel_pin, num_pixels, 
-                                       brightness=brightness, 
+                                       brightness=1.0, 
                                        auto_write=False)
-        self.pixels.fill((0, 0, 0))
-        self.pixels.show()
+        self.leds = LedEngine(self.pixels, brightness=brightness)
+        self.leds.flush()  # start dark
         
         # Setup ADXL345 Accelerometer using shared I2C
-        try:
-            # Try default address first (0x53)
+        self.stream = None
+        if streaming:
+            self._setup_stream(i2c, int_pin, accel_device)
+        if self.stream is None:
             try:
-                self.accel = adafruit_adxl34x.ADXL345(i2c)
-                print("ADXL345 found at address 0x53")
-            except:
-                # Try alternate address (0x1D)
-                self.accel = adafruit_adxl34x.ADXL345(i2c, address=0x1D)
-                print("ADXL345 found at address 0x1D")
-            
-            self.has_accel = True
-            print("ADXL345 Accelerometer initialized")
-        except Exception as e:
-            print(f"No accelerometer found: {e}")
-            self.has_accel = False
+                # Try default address first (0x53)
+                try:
+                    self.accel = adafruit_adxl34x.ADXL345(i2c)
+                    print("ADXL345 found at address 0x53")
+                except (OSError, ValueError):
+                    # Try alternate address (0x1D)
+                    self.accel = adafruit_adxl34x.ADXL345(i2c, address=0x1D)
+                    print("ADXL345 found at address 0x1D")
+                
+                self.has_accel = True
+                print("ADXL345 Accelerometer initialized")
+            except Exception as e:
+                print(f"No accelerometer found: {e}")
+                self.has_accel = False
+        
+        # Streaming pickup filter, tuned to the rate samples actually arrive at
+        self.detector = PickupDetector(sample_hz=self.stream.sample_hz if self.stream is not None
+                                       else sample_hz)
         
         self.is_picked_up = False
         self.manual_override = False  # For game over red light
         self.last_pickup_time = 1.0  # Track last pickup time
         self.hold_duration = 2.0  # Hold light for 2 seconds after pickup (可以调整)
     
+    def _setup_stream(self, i2c, int_pin, accel_device):
+        """Put the ADXL345 in FIFO stream mode with the activity interrupt"""
+        try:
+            from adxl345_fifo import ADXL345Fifo
+            if accel_device is None:
+                from adafruit_bus_device.i2c_device import I2CDevice
+                try:
+                    accel_device = I2CDevice(i2c, 0x53)
+                except ValueError:
+                    accel_device = I2CDevice(i2c, 0x1D)
+            self.stream = ADXL345Fifo(accel_device, activity_g=STREAM_WAKE_G, int_pin=int_pin)
+            self._samples = []
+            self.has_accel = True
+            print(f"ADXL345 streaming at {self.stream.sample_hz:g} Hz (FIFO + activity interrupt"
+                  f"{', INT1 wired' if int_pin is not None else ''})")
+        except (ImportError, OSError, ValueError) as e:
+            print(f"ADXL345 streaming unavailable ({e}), polling instead")
+    
     def check_pickup(self):
         """Check if device is picked up based on acceleration"""
         if not self.has_accel:
             return False
         
         try:
+            if self.stream is not None:
+                return self._check_stream()
             x, y, z = self.accel.acceleration
-            
-            # Calculate total acceleration magnitude
-            total = (x**2 + y**2 + z**2) ** 0.5
-            
-            # Lower threshold for easier triggering
-            if total > 8 or z > 8: 
-                return True
+            return self.detector.feed(x, y, z)
+        except OSError:
             return False
-            
-        except:
+    
+    def _check_stream(self):
+        """Streaming mode: idle until the activity flag, then one FIFO drain per watermark"""
+        stream = self.stream
+        if not stream.streaming:
+            if stream.activity():
+                stream.start()  # collect from here; the detector decides once a batch is in
             return False
+        if not stream.ready():
+            return self.detector.picked_up  # no new batch yet - the last verdict stands
+        
+        # Drain every queued sample in one go so no movement is missed
+        samples = self._samples
+        samples.clear()
+        stream.drain(samples)
+        picked_up = self.detector.feed_many(samples)
+        if not self.detector.picked_up:
+            stream.stop()  # settled (or only a knock) - back to waiting for activity
+        return picked_up
     
     def update(self):
         """Update NeoPixel based on pickup state (call this frequently)"""
         
-        # Don't update if manual override is active (e.g., game over)
+        # Don't read the sensor while the game owns the lights - just advance the effect
         if self.manual_override:
+            self.leds.tick()
             return
         
-        picked_up = self.check_pickup()
+        # Read the sensor only in a bus slot the arbiter grants
+        if self.arbiter:
+            if self.arbiter.sensor_slot():
+                start = ticks_ms()
+                picked_up = self.check_pickup()
+                self.arbiter.sensor_done(start)
+            else:
+                picked_up = False  # no new sample - the hold timer keeps the light as is
+        else:
+            picked_up = self.check_pickup()
         current_time = time.monotonic()
         
         # If picked up, update last pickup time
@@ -84,35 +151,44 @@ class AccelMonitor:
         # Keep light on if within hold duration
         should_be_on = (current_time - self.last_pickup_time) < self.hold_duration
         
-        # Only update if state changed (reduces unnecessary updates)
+        # Only start / stop the effect when the state changes
         if should_be_on != self.is_picked_up:
             self.is_picked_up = should_be_on
             
             if should_be_on:
-                # Device picked up or recently picked up - blue light
-                self.pixels.fill((0, 0, 100))
-                self.pixels.show()
+                # Device picked up or recently picked up - blue pulse
+                self.leds.play(Pulse(PICKUP_BLUE))
             else:
                 # Device at rest - turn off
-                self.pixels.fill((0, 0, 0))
-                self.pixels.show()
+                self.leds.stop()
+                self.leds.fill_rgb(0, 0, 0)
+        
+        self.leds.tick()
     
     def set_red(self):
-        """Set red light (for game over) - overrides pickup detection"""
+        """Flash red, then hold it (for game over) - overrides pickup detection"""
+        self.manual_override = True
+        self.leds.play(Flash(GAME_OVER_RED))
+    
+    def show_progress(self, done, total):
+        """Level progress bar (done of total obstacles) - overrides pickup detection"""
         self.manual_override = True
-        self.pixels.fill((255, 0, 0))
-        self.pixels.show()
+        self.leds.stop()
+        r, g, b = PROGRESS_GREEN
+        self.leds.bar(r, g, b, done, total)
     
     def clear_override(self):
         """Clear manual override and return to normal pickup detection"""
         self.manual_override = False
-        self.pixels.fill((0, 0, 0))
-        self.pixels.show()
+        self.is_picked_up = False
+        self.leds.stop()
+        self.leds.fill_rgb(0, 0, 0)  # no strip write if it is already dark
     
     def off(self):
         """Turn off all lights"""
-        self.pixels.fill((0, 0, 0))
-        self.pixels.show()
+        self.leds.stop()
+        self.leds.fill_rgb(0, 0, 0)
+        self.leds.flush()
 
 # Standalone Test
 if __name__ == "__main__":
@@ -126,11 +202,17 @@ if __name__ == "__main__":
     
     monitor = AccelMonitor(i2c, neopixel_pin=board.D10, num_pixels=1)
     
+    # Print raw samples as CSV (x,y,z at 20 Hz) for tools/pickup_trace.py --rate 20
+    PRINT_TRACE = False
+    
     print("Monitoring... Pick up the device to see blue light")
     print("Press Ctrl+C to stop")
     
     try:
         while True:
+            if PRINT_TRACE and monitor.has_accel:
+                x, y, z = monitor.accel.acceleration
+                print(f"{x:.3f},{y:.3f},{z:.3f}")
             monitor.update()
             time.sleep(0.05)  # Check 20 times per second
     except KeyboardInterrupt:
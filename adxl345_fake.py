@@ -0,0 +1,127 @@
+# adxl345_fake.py
+# Register-level ADXL345 stand-in for testing FIFO / activity mode off-device.
+# Speaks the adafruit_bus_device I2CDevice interface, so ADXL345Fifo can't tell it from the chip.
+import struct
+
+from adxl345_fifo import (DEVID, THRESH_ACT, ACT_INACT_CTL, INT_ENABLE, INT_MAP, INT_SOURCE,
+                          DATAX0, FIFO_CTL, FIFO_STATUS, INT_ACTIVITY, INT_WATERMARK,
+                          INT_OVERRUN, FIFO_DEPTH, SCALE, ACT_LSB_G, STANDARD_GRAVITY)
+
+DATAZ1 = DATAX0 + 5
+
+
+class _IntPin:
+    """INT1 as a DigitalInOut-like object (active high)"""
+
+    def __init__(self, chip):
+        self._chip = chip
+
+    @property
+    def value(self):
+        chip = self._chip
+        pending = chip.regs[INT_SOURCE] & chip.regs[INT_ENABLE] & ~chip.regs[INT_MAP]
+        return bool(pending)
+
+
+class FakeADXL345:
+    """
+    Simulated ADXL345 registers, FIFO and activity detection
+    Provides:
+        - push(x, y, z) → feed one sample in m/s^2 (as if the chip sampled it)
+        - int1 → pin object for the INT1 line
+        - transactions → I2C transactions seen
+    """
+
+    def __init__(self):
+        self.regs = bytearray(64)
+        self.regs[DEVID] = 0xE5
+        self.fifo = []
+        self.int1 = _IntPin(self)
+        self.transactions = 0
+        self._pointer = 0
+        self._reference = (0, 0, 0)
+        self._latest = (0, 0, 0)
+
+    # I2CDevice interface
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def write(self, buf, start=0, end=None):
+        buf = bytes(buf[start:end])
+        self.transactions += 1
+        self._pointer = buf[0]
+        for value in buf[1:]:
+            self._write_reg(self._pointer, value)
+            self._pointer += 1
+
+    def readinto(self, buf, start=0, end=None):
+        end = len(buf) if end is None else end
+        for i in range(start, end):
+            buf[i] = self._read_reg(self._pointer)
+            self._pointer += 1
+        self.transactions += 1
+
+    def write_then_readinto(self, out_buf, in_buf, out_start=0, out_end=None, in_start=0, in_end=None):
+        self._pointer = out_buf[out_start]
+        self.readinto(in_buf, in_start, in_end)
+
+    # Register behaviour
+    def _write_reg(self, reg, value):
+        self.regs[reg] = value
+        if reg == ACT_INACT_CTL:
+            self._reference = None  # ac-coupled: next sample becomes the reference
+        elif reg == FIFO_CTL:
+            self.fifo = []
+            self._update_status()
+
+    def _read_reg(self, reg):
+        if DATAX0 <= reg <= DATAZ1:
+            current = self.fifo[0] if self.fifo else self._latest
+            value = struct.pack('<hhh', *current)[reg - DATAX0]
+            if reg == DATAZ1 and self.fifo:
+                self.fifo.pop(0)  # FIFO pops once the sample has been read out
+                self._update_status()
+            return value
+        if reg == FIFO_STATUS:
+            return min(len(self.fifo), FIFO_DEPTH)
+        if reg == INT_SOURCE:
+            value = self.regs[INT_SOURCE]
+            self.regs[INT_SOURCE] &= ~INT_ACTIVITY & 0xFF  # latched bits clear on read
+            return value
+        return self.regs[reg]
+
+    def _update_status(self):
+        watermark = self.regs[FIFO_CTL] & 0x1F
+        if watermark and len(self.fifo) >= watermark:
+            self.regs[INT_SOURCE] |= INT_WATERMARK
+        else:
+            self.regs[INT_SOURCE] &= ~INT_WATERMARK & 0xFF
+
+    def push(self, x, y, z):
+        """Sample (x, y, z) m/s^2 into the data registers / FIFO"""
+        raw = (int(x / SCALE), int(y / SCALE), int(z / SCALE))
+        self._latest = raw
+
+        if self.regs[FIFO_CTL] & 0xC0:  # any FIFO mode except bypass
+            self.fifo.append(raw)
+            if len(self.fifo) > FIFO_DEPTH:
+                self.fifo.pop(0)
+                self.regs[INT_SOURCE] |= INT_OVERRUN
+            self._update_status()
+
+        # Activity: any enabled axis moved more than THRESH_ACT from the reference
+        ctl = self.regs[ACT_INACT_CTL]
+        threshold = self.regs[THRESH_ACT] * ACT_LSB_G * STANDARD_GRAVITY / SCALE
+        if ctl & 0x80:
+            if self._reference is None:
+                self._reference = raw
+            reference = self._reference
+        else:
+            reference = (0, 0, 0)
+        for axis, enable in enumerate((0x40, 0x20, 0x10)):
+            if ctl & enable and abs(raw[axis] - reference[axis]) > threshold:
+                self.regs[INT_SOURCE] |= INT_ACTIVITY
+                break
@@ -0,0 +1,155 @@
+# adxl345_fifo.py
+# Register-level ADXL345 driver for FIFO streaming + activity detection.
+# Works with an adafruit_bus_device I2CDevice or with adxl345_fake.FakeADXL345.
+import struct
+
+# Registers
+DEVID = 0x00
+THRESH_ACT = 0x24
+ACT_INACT_CTL = 0x27
+BW_RATE = 0x2C
+POWER_CTL = 0x2D
+INT_ENABLE = 0x2E
+INT_MAP = 0x2F
+INT_SOURCE = 0x30
+DATA_FORMAT = 0x31
+DATAX0 = 0x32
+FIFO_CTL = 0x38
+FIFO_STATUS = 0x39
+
+# Bits / values
+INT_ACTIVITY = 0x10
+INT_WATERMARK = 0x02
+INT_OVERRUN = 0x01
+MEASURE = 0x08
+FULL_RES = 0x08
+FIFO_BYPASS = 0x00
+FIFO_STREAM = 0x80
+ACT_AC_XYZ = 0xF0          # ac-coupled activity on x, y and z
+RATE_25HZ = 0x08           # 12.5 Hz bandwidth - still covers hand tremor
+RATE_100HZ = 0x0A
+
+FIFO_DEPTH = 32
+STANDARD_GRAVITY = 9.80665
+SCALE = 0.004 * STANDARD_GRAVITY    # full-resolution LSB in m/s^2
+ACT_LSB_G = 0.0625                  # THRESH_ACT scale, g per LSB
+
+
+class ADXL345Fifo:
+    """
+    ADXL345 that waits on the activity interrupt, then streams through its FIFO
+    Provides:
+        - activity() → True if the activity flag fired since the last check (idle)
+        - start() / stop() → stream samples into the FIFO / go back to waiting for activity
+        - ready() → True once the FIFO holds a watermark's worth of samples (streaming)
+        - drain() → every queued sample as (x, y, z) in m/s^2
+        - sample_hz → output data rate
+        - transactions → bus transactions issued so far
+    Idle, the FIFO is bypassed and only activity raises INT1; streaming, only the
+    watermark does. With int_pin wired to INT1, activity() and ready() read the pin
+    instead of INT_SOURCE, so waiting costs no bus traffic in either state.
+    """
+
+    def __init__(self, device, rate=RATE_25HZ, activity_g=0.75, watermark=16, int_pin=None):
+        """
+        Args:
+            device: I2CDevice (or FakeADXL345) for the accelerometer
+            rate: BW_RATE code (default: 0x08 = 25 Hz)
+            activity_g: Activity threshold above the ac reference, in g (default: 0.75)
+            watermark: FIFO_CTL sample count for the watermark flag (default: 16)
+            int_pin: DigitalInOut connected to INT1, active high (optional)
+        """
+        self.device = device
+        self.int_pin = int_pin
+        self.sample_hz = 3200 / (1 << (15 - (rate & 0x0F)))
+        self.watermark = watermark & 0x1F
+        self.streaming = False
+        self.transactions = 0
+        self.overruns = 0
+        self._reg = bytearray(1)
+        self._one = bytearray(1)
+        self._sample = bytearray(6)
+
+        if self._read(DEVID) != 0xE5:
+            raise OSError("ADXL345 not found")
+
+        self._write(POWER_CTL, 0)  # standby while configuring
+        self._write(BW_RATE, rate)
+        self._write(DATA_FORMAT, FULL_RES)
+        self._write(THRESH_ACT, max(1, min(255, int(activity_g / ACT_LSB_G))))
+        self._write(ACT_INACT_CTL, ACT_AC_XYZ)
+        self._write(FIFO_CTL, FIFO_BYPASS)
+        self._write(INT_MAP, 0)  # everything on INT1
+        self._write(INT_ENABLE, INT_ACTIVITY)
+        self._write(POWER_CTL, MEASURE)
+        self._read(INT_SOURCE)  # clear anything latched during setup
+
+    def _write(self, reg, value):
+        with self.device as dev:
+            dev.write(bytes((reg, value)))
+        self.transactions += 1
+
+    def _read(self, reg):
+        self._reg[0] = reg
+        with self.device as dev:
+            dev.write_then_readinto(self._reg, self._one)
+        self.transactions += 1
+        return self._one[0]
+
+    def activity(self):
+        """Check (and clear) the activity flag"""
+        if self.int_pin is not None and not self.int_pin.value:
+            return False  # INT1 low - nothing happened, no bus traffic
+        return bool(self._read(INT_SOURCE) & INT_ACTIVITY)
+
+    def start(self):
+        """Start filling the FIFO from now on; INT1 follows the watermark instead of activity"""
+        self._write(FIFO_CTL, FIFO_STREAM | self.watermark)
+        self._write(INT_ENABLE, INT_WATERMARK)
+        self.streaming = True
+
+    def stop(self):
+        """Bypass the FIFO and wait for activity again"""
+        self._write(FIFO_CTL, FIFO_BYPASS)
+        # Re-take the ac reference so a new resting orientation doesn't stay "active"
+        self._write(ACT_INACT_CTL, ACT_AC_XYZ)
+        self._write(INT_ENABLE, INT_ACTIVITY)
+        self._read(INT_SOURCE)  # drop activity latched while streaming
+        self.streaming = False
+
+    def ready(self):
+        """True if a watermark's worth of samples is waiting"""
+        if self.int_pin is not None:
+            return bool(self.int_pin.value)  # no bus traffic
+        source = self._read(INT_SOURCE)
+        if source & INT_OVERRUN:
+            self.overruns += 1
+        return bool(source & INT_WATERMARK)
+
+    def drain(self, out=None):
+        """
+        Read every sample waiting in the FIFO
+
+        Each entry is one 6-byte read of DATAX0..DATAZ1 (the FIFO pops on
+        it); all of them go back-to-back while holding the bus once.
+
+        Args:
+            out: List to append (x, y, z) tuples to (default: new list)
+        """
+        if out is None:
+            out = []
+        entries = self._read(FIFO_STATUS) & 0x3F
+        if not entries:
+            return out
+        if entries >= FIFO_DEPTH:
+            self.overruns += 1  # full: older samples may have been dropped
+
+        self._reg[0] = DATAX0
+        sample = self._sample
+        with self.device as dev:
+            for _ in range(entries):
+                dev.write_then_readinto(self._reg, sample)
+                x, y, z = struct.unpack('<hhh', sample)
+                out.append((x * SCALE, y * SCALE, z * SCALE))
+        self.transactions += entries
+        return out
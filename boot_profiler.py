@@ -0,0 +1,99 @@
+# boot_profiler.py
+# Per-module import timing / heap use at boot, plus on-demand and idle-time (prefetch) loading.
+import gc
+import sys
+import time
+
+
+def mem_free():
+    """Free heap in bytes (CircuitPython only; 0 on a host)"""
+    return gc.mem_free() if hasattr(gc, "mem_free") else 0
+
+
+class BootProfiler:
+    """
+    Record how long each import takes and how much heap it uses
+    Provides:
+        - load(name) → import a module and record time / heap delta
+        - mark(label) → timestamp a boot milestone (e.g. first pixel)
+        - queue(*names) / prefetch_step() → import deferred modules one per idle slot
+        - report() → print the collected table over serial
+    """
+
+    def __init__(self):
+        self._start_ns = time.monotonic_ns()
+        self.records = []    # (name, import_ms, heap_bytes, at_ms)
+        self.marks = []      # (label, at_ms)
+        self._pending = []
+
+    def _elapsed_ms(self):
+        return (time.monotonic_ns() - self._start_ns) / 1000000
+
+    def load(self, name):
+        """Import a (dotted) module, recording time and heap used. Already-loaded modules are free"""
+        module = sys.modules.get(name)
+        if module is not None:
+            return module
+
+        heap_before = mem_free()
+        t0 = time.monotonic_ns()
+        __import__(name)
+        import_ms = (time.monotonic_ns() - t0) / 1000000
+        self.records.append((name, import_ms, heap_before - mem_free(), self._elapsed_ms()))
+        return sys.modules[name]
+
+    def mark(self, label):
+        """Record a boot milestone"""
+        self.marks.append((label, self._elapsed_ms()))
+
+    def queue(self, *names):
+        """Defer modules to be imported later by prefetch_step()"""
+        for name in names:
+            if name not in self._pending:
+                self._pending.append(name)
+
+    def prefetch_step(self):
+        """Import the next queued module. Returns False once the queue is empty"""
+        if not self._pending:
+            return False
+        self.load(self._pending.pop(0))
+        return True
+
+    @property
+    def prefetch_done(self):
+        return not self._pending
+
+    def report(self):
+        """Print per-module import cost and milestones"""
+        print("=== Boot Import Profile ===")
+        print(f"{'module':<28}{'ms':>8}{'heap':>8}{'at ms':>9}")
+        total_ms = 0
+        total_heap = 0
+        for name, import_ms, heap, at_ms in self.records:
+            print(f"{name:<28}{import_ms:>8.1f}{heap:>8}{at_ms:>9.1f}")
+            total_ms += import_ms
+            total_heap += heap
+        print(f"{'total':<28}{total_ms:>8.1f}{total_heap:>8}")
+        for label, at_ms in self.marks:
+            print(f"* {label} at {at_ms:.1f} ms")
+
+
+class LazyModule:
+    """Stand-in for a module that is only imported on first attribute access"""
+
+    def __init__(self, name, profiler=None):
+        self._name = name
+        self._profiler = profiler
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            if self._profiler is not None:
+                self._module = self._profiler.load(self._name)
+            else:
+                __import__(self._name)
+                self._module = sys.modules[self._name]
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
@@ -0,0 +1,103 @@
+# bus_arbiter.py
+# Cooperative arbiter for the I2C bus shared by the SSD1306 and the ADXL345.
+# Display frames always go first; sensor reads only get idle slots, at a capped rate.
+# Times are ticks.py milliseconds (small ints, no heap use per frame). A transfer shorter
+# than 1 ms counts 1 when it crosses a tick and 0 otherwise, so the totals stay unbiased.
+from ticks import ticks_ms, ticks_add, ticks_diff
+
+
+class BusArbiter:
+    """
+    Owns the shared busio.I2C and decides who may use it
+    Provides:
+        - display_pending → set while a display frame is waiting to be pushed
+        - display_done(start, end, updated) → record a display transfer, counted as bus time
+        - sensor_slot() → True if a sensor read may go now (rate-limited, yields to display)
+        - sensor_done(start) → close a granted sensor read that started at tick start
+        - utilisation / mean_wait_ms / report()
+    """
+
+    def __init__(self, i2c, sensor_hz=20, window_ms=1000):
+        """
+        Args:
+            i2c: Shared busio.I2C instance
+            sensor_hz: Maximum sensor polls per second (default: 20)
+            window_ms: Length of the utilisation measurement window (default: 1000)
+        """
+        self.i2c = i2c
+        self.display_pending = False
+        self.set_sensor_rate(sensor_hz)
+        self._window_ms = window_ms
+
+        self._next_sensor = ticks_ms()
+        self._sensor_requested = None
+
+        # stats (current window)
+        self._window_start = self._next_sensor
+        self._busy_ms = 0
+        self.utilisation = 0.0       # fraction of the last full window the bus was busy
+        self.display_ms = 0          # cumulative
+        self.sensor_ms = 0           # cumulative
+        self.sensor_reads = 0
+        self.sensor_deferred = 0     # slots refused because a display frame was pending
+        self._wait_total_ms = 0
+
+    def set_sensor_rate(self, sensor_hz):
+        """Change the sensor poll cap"""
+        self.sensor_hz = sensor_hz
+        self._sensor_period_ms = 1000 // sensor_hz if sensor_hz else 0
+
+    def _account(self, start, end):
+        self._busy_ms += ticks_diff(end, start)
+        elapsed = ticks_diff(end, self._window_start)
+        if elapsed >= self._window_ms:
+            self.utilisation = self._busy_ms / elapsed
+            self._busy_ms = 0
+            self._window_start = end
+
+    def display_done(self, start, end, updated=True):
+        """Record a display transfer (e.g. display.refresh) that ran from tick start to end"""
+        if updated:
+            self.display_pending = False  # a dropped frame is still pending
+        self.display_ms += ticks_diff(end, start)
+        self._account(start, end)
+
+    def sensor_slot(self):
+        """Ask for a sensor read. Returns True (and starts the read) if the bus is free for it"""
+        now = ticks_ms()
+        if self._sensor_requested is None:
+            self._sensor_requested = now
+
+        if ticks_diff(self._next_sensor, now) > 0:
+            return False
+        if self.display_pending:
+            self.sensor_deferred += 1
+            return False
+
+        # Only contention counts as waiting, not the rate cap
+        waited_since = self._sensor_requested
+        if ticks_diff(self._next_sensor, waited_since) > 0:
+            waited_since = self._next_sensor
+        self._wait_total_ms += ticks_diff(now, waited_since)
+        self._sensor_requested = None
+        self._next_sensor = ticks_add(now, self._sensor_period_ms)
+        return True
+
+    def sensor_done(self, start):
+        """Record a finished sensor read that started at tick start"""
+        end = ticks_ms()
+        self.sensor_reads += 1
+        self.sensor_ms += ticks_diff(end, start)
+        self._account(start, end)
+
+    @property
+    def mean_wait_ms(self):
+        """Average time a sensor read waited for its slot"""
+        if not self.sensor_reads:
+            return 0.0
+        return self._wait_total_ms / self.sensor_reads
+
+    def report(self):
+        print(f"I2C bus: {self.utilisation:.0%} busy, display {self.display_ms} ms, "
+              f"sensor {self.sensor_ms} ms / {self.sensor_reads} reads "
+              f"(wait {self.mean_wait_ms:.1f} ms, deferred {self.sensor_deferred})")
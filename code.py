@@ -1,17 +1,29 @@
 # code.py
 #Process: intro-words, 2. select mode 3.enter the games.
-import time
-import board
-import digitalio
-import busio
-import displayio
-import terminalio
-from adafruit_display_text import label
-import i2cdisplaybus
-import adafruit_displayio_ssd1306
-from rotary_encoder import RotaryEncoder
-from menu_screen import MenuScreen
-from accel_monitor import AccelMonitor
+import asyncio
+from boot_profiler import BootProfiler, LazyModule
+
+# Boot profiler: per-module import time + heap. Only what the first intro
+# line needs is imported up front; the rest loads on demand or while idle.
+profiler = BootProfiler()
+board = profiler.load("board")
+busio = profiler.load("busio")
+displayio = profiler.load("displayio")
+terminalio = profiler.load("terminalio")
+label = profiler.load("adafruit_display_text.label")
+text_cache = profiler.load("text_cache")
+i2cdisplaybus = profiler.load("i2cdisplaybus")
+adafruit_displayio_ssd1306 = profiler.load("adafruit_displayio_ssd1306")
+sprites = profiler.load("sprites")
+display_refresh = profiler.load("display_refresh")
+bus_arbiter = profiler.load("bus_arbiter")
+runtime_mod = profiler.load("runtime")
+
+# Not needed before the first pixel
+menu_screen = LazyModule("menu_screen", profiler)
+rotary_encoder = LazyModule("rotary_encoder", profiler)
+profiler.queue("accel_monitor", "rotary_encoder", "menu_screen",
+               "json", "game_core", "level_pack", "game_easy", "endless")
 
 # Display Setup
 displayio.release_displays()
@@ -19,15 +31,73 @@ i2c = busio.I2C(board.SCL, board.SDA)
 display_bus = i2cdisplaybus.I2CDisplayBus(i2c, device_address=0x3C)
 display = adafruit_displayio_ssd1306.SSD1306(display_bus, width=128, height=64)
 
-# Accelerometer Monitor Setup
-accel_monitor = AccelMonitor(i2c,neopixel_pin=board.D10, num_pixels=8, brightness=0.3)
+# Bus arbiter: display frames first, accelerometer polled at most 20 Hz in idle slots
+arbiter = bus_arbiter.BusArbiter(i2c, sensor_hz=20)
+
+# Explicit refresh: one I2C frame push per loop pass, none when nothing changed
+refresher = display_refresh.RefreshController(display, target_fps=30, max_fps=33, arbiter=arbiter)
+
+# Accelerometer Monitor - created after the first intro line is on screen
+accel_monitor = None
+# ADXL345 INT1 pin (opt-in): None polls the FIFO watermark over I2C. Set to board.D7 once
+# INT1 is wired there (see README) so polls between events are a pin read, not bus traffic
+ACCEL_INT_PIN = None
+
+# Buttons: D6 menu, D1 game - scanned in the background, edges queued with timestamps
+input_events = profiler.load("input_events")
+inputs = input_events.InputManager({"menu": board.D6, "jump": board.D1})
+
+# Rotary Encoder - created when the menu first opens, then serviced by inputs.poll()
+encoder = None
+
+# Cooperative runtime: input (200 Hz), sensor (20 Hz) and render (refresher fps) tasks
+# run next to whichever screen task is active; screens only hold logic.
+runtime = runtime_mod.Runtime(inputs, refresher, input_hz=200, sensor_hz=20)
+SCREEN_PERIOD = 0.02  # screen logic rate while waiting for input
+
+# Endless mode seed: None picks a new one each game (it is printed), a number replays that run
+ENDLESS_SEED = None
 
-# Button for menu (D6)
-button = digitalio.DigitalInOut(board.D6)
-button.switch_to_input(pull=digitalio.Pull.UP)
+# Input recording (opt-in): each game's jump input, one bit per physics tick, saved to
+# /replay.sjr on every game over and at the end (printed as hex when CIRCUITPY is
+# read-only) - replay with tools/replay.py
+RECORD_INPUTS = False
+recorder = None
+if RECORD_INPUTS:
+    recorder = profiler.load("input_recorder").InputRecorder()
 
-# Rotary Encoder Setup
-encoder = RotaryEncoder(board.D9, board.D8)
+# Frame profiler (opt-in): per-phase timings for every screen / game frame.
+# Press the menu button in-game to dump it; it is also printed after each game.
+PROFILE_FRAMES = False
+frame_profile = None
+if PROFILE_FRAMES:
+    frame_profiler = profiler.load("frame_profiler")
+    frame_profile = frame_profiler.FrameProfiler()
+    runtime.profiler = frame_profile
+
+async def next_frame():
+    """End a screen-logic pass and yield to the runtime tasks"""
+    if frame_profile is not None:
+        frame_profile.lap(frame_profiler.LOGIC)
+        frame_profile.end_frame()
+    await asyncio.sleep(SCREEN_PERIOD)
+    if frame_profile is not None:
+        frame_profile.lap(frame_profiler.IDLE)
+
+def start_accel_monitor():
+    """Bring up the ADXL345 + NeoPixels (imports neopixel / adafruit_adxl34x)"""
+    global accel_monitor
+    AccelMonitor = profiler.load("accel_monitor").AccelMonitor
+    # streaming: ADXL345 FIFO + activity interrupt. INT1 is active high; the pull-down
+    # keeps an unconnected pin low instead of floating into false wake-ups
+    accel_int = None
+    if ACCEL_INT_PIN is not None:
+        digitalio = profiler.load("digitalio")
+        accel_int = digitalio.DigitalInOut(ACCEL_INT_PIN)
+        accel_int.switch_to_input(pull=digitalio.Pull.DOWN)
+    accel_monitor = AccelMonitor(i2c, neopixel_pin=board.D10, num_pixels=8, brightness=0.3,
+                                 arbiter=arbiter, streaming=True, int_pin=accel_int)
+    runtime.accel_monitor = accel_monitor
 
 # Intro Lines
 intro_lines = [
@@ -55,94 +125,134 @@ def wrap_text(text, max_chars=20):
     lines.append(current)
     return "\n".join(lines)
 
-def show_intro():
+# Intro screen - built once; each line is rendered a single time (the first before
+# the first pixel, the rest while the player reads) and swapped in on a press
+intro_group = None
+intro_text = None
+
+async def show_intro():
     """Display intro animation"""
-    intro_group = displayio.Group()
-    display.root_group = intro_group
-    intro_label = label.Label(terminalio.FONT, text="", x=10, y=20)
-    intro_group.append(intro_label)
+    global intro_group, intro_text
+    if intro_group is None:
+        intro_group = displayio.Group()
+        intro_text = text_cache.TextCache(x=10, y=20)
+        intro_group.append(intro_text.group)
+        
+        # Star in the corner (shared sprite cache)
+        intro_star = sprites.get_tiles("star", 1, "intro")[0]
+        intro_star.x = 112
+        intro_star.y = 2
+        sprites.attach(intro_group, intro_star)
+    refresher.show(intro_group)
     
     current_intro = 0
-    last_button = True
-    intro_label.text = wrap_text(intro_lines[current_intro])
+    intro_text.add(current_intro, wrap_text(intro_lines[current_intro]))
+    intro_text.show(current_intro)
+    refresher.refresh()
     
+    if accel_monitor is None:
+        profiler.mark("first pixel")
+        start_accel_monitor()
+    
+    inputs.clear()
     while True:
-        accel_monitor.update()
+        # Finish deferred imports, then pre-render the next intro line, while the player reads
+        if profiler.prefetch_step():
+            if profiler.prefetch_done:
+                profiler.report()
+                print("Sprite cache:", sprites.footprint())
+        elif len(intro_text) < len(intro_lines):
+            line = len(intro_text)
+            intro_text.add(line, wrap_text(intro_lines[line]))
         
-        current_state = button.value
-        if last_button and not current_state:
+        if inputs.pressed("menu"):
             current_intro += 1
             if current_intro >= len(intro_lines):
                 return  # Intro complete
-            intro_label.text = wrap_text(intro_lines[current_intro])
-            time.sleep(0.2)
-        last_button = current_state
-        time.sleep(0.01)
+            intro_text.add(current_intro, wrap_text(intro_lines[current_intro]))
+            intro_text.show(current_intro)
+            refresher.mark_dirty()
+        await next_frame()
 
-def show_menu():
+async def show_menu():
     """Menu selection"""
-    menu = MenuScreen(display, encoder, button)
-    last_button = False
+    global encoder
+    if encoder is None:
+        encoder = rotary_encoder.RotaryEncoder(board.D9, board.D8)
+        inputs.encoder = encoder
+    menu = menu_screen.MenuScreen(display, inputs, refresher)
+    inputs.clear()
     
     while True:
-        accel_monitor.update()
-        
         menu.draw()
         result = menu.update()
-        current_state = button.value
         
-        if result and last_button and not current_state:
+        if result:
             print("Selected difficulty:", result)
             return result  # Return selected difficulty
         
-        last_button = current_state
-        time.sleep(0.01)
+        await next_frame()
 
-def start_game(difficulty):
+async def start_game(difficulty):
     """Start game based on difficulty"""
     print(f"Starting game with difficulty: {difficulty}")
     
-    # Create D1 button for game
-    game_button = digitalio.DigitalInOut(board.D1)
-    game_button.switch_to_input(pull=digitalio.Pull.UP)
+    # D1 jump button events come from the shared InputManager
+    inputs.clear()
     
     # Turn off pickup detection during game (game controls the lights)
     accel_monitor.clear_override()
     
     # Select different configurations based on difficulty
     if difficulty == "Easy":
-        from game_easy import run_game
-        run_game(display, game_button, accel_monitor)
+        from game_easy import run_game_async
+        await run_game_async(display, inputs, accel_monitor, refresher=refresher,
+                             profiler=frame_profile, recorder=recorder)
     
     elif difficulty == "Medium":
         print("Medium mode - using game_easy with modified settings")
-        from game_easy import run_game
-        run_game(display, game_button, accel_monitor, difficulty="medium")
+        from game_easy import run_game_async
+        await run_game_async(display, inputs, accel_monitor, difficulty="medium", refresher=refresher,
+                             profiler=frame_profile, recorder=recorder)
     
     elif difficulty == "Hard":
         print("Hard mode - using game_easy with hard settings")
-        from game_easy import run_game
-        run_game(display, game_button, accel_monitor, difficulty="hard")
+        from game_easy import run_game_async
+        await run_game_async(display, inputs, accel_monitor, difficulty="hard", refresher=refresher,
+                             profiler=frame_profile, recorder=recorder)
+    
+    elif difficulty == "Endless":
+        # The game prints the seed, so a good run can be replayed by setting ENDLESS_SEED
+        from ticks import ticks_ms
+        seed = ENDLESS_SEED if ENDLESS_SEED is not None else ticks_ms()
+        from game_easy import run_game_async
+        await run_game_async(display, inputs, accel_monitor, difficulty="endless", refresher=refresher,
+                             profiler=frame_profile, seed=seed, recorder=recorder)
     
     else:
         print("Unknown difficulty")
-        time.sleep(2)
+        await asyncio.sleep(2)
 
-def main():
-    """Main program loop"""
+async def main():
+    """Main program loop (the screen-logic task)"""
     while True:
         # 1. Intro
-        show_intro()
+        await show_intro()
         
         # 2. Menu Selection
-        selected_difficulty = show_menu()
+        selected_difficulty = await show_menu()
         
         # 3. Start Game
-        start_game(selected_difficulty)
+        await start_game(selected_difficulty)
+        arbiter.report()
+        if frame_profile is not None:
+            frame_profile.report()
+        if recorder is not None and recorder.ticks:
+            recorder.save()
         
         # Ending Screen
         end_group = displayio.Group()
-        display.root_group = end_group
+        refresher.show(end_group)
         end_label = label.Label(
             terminalio.FONT, 
             text="Thanks for\nplaying!\n\nPress to\nrestart", 
@@ -152,21 +262,15 @@ def main():
         end_group.append(end_label)
         
         # Wait for restart
-        last_button = button.value
-        while True:
-            accel_monitor.update()
-            
-            current_state = button.value
-            if last_button and not current_state:
-                break
-            last_button = current_state
-            time.sleep(0.01)
-        
-        time.sleep(0.3)  # Debounce
+        inputs.clear()
+        while not inputs.pressed("menu"):
+            await next_frame()
 
 if __name__ == "__main__":
     try:
-        main()
+        runtime.run(main())
     except KeyboardInterrupt:
         print("\nProgram stopped by user")
-        accel_monitor.off()
+        arbiter.report()
+        if accel_monitor:
+            accel_monitor.off()
@@ -0,0 +1,69 @@
+# collision.py
+# Pixel-exact collision masks: one integer per sprite row, so the narrow phase is AND + shift.
+from sprite_patterns import PATTERNS, row_bits
+
+_masks = {}
+
+
+class Mask:
+    """
+    Per-row bitmask of a sprite; bit (width - 1 - x) is set for an opaque pixel x
+    Provides:
+        - width, height
+        - rows → tuple of row integers, top to bottom
+    """
+
+    def __init__(self, width, height, rows):
+        """
+        Args:
+            width, height: Sprite size in pixels
+            rows: One integer per row, MSB = leftmost pixel
+        """
+        self.width = width
+        self.height = height
+        self.rows = tuple(rows)
+
+
+def get_mask(name):
+    """Mask for a sprite pattern (built on first use, then cached)"""
+    mask = _masks.get(name)
+    if mask is None:
+        width, height, _ = PATTERNS[name]
+        mask = Mask(width, height, [row_bits(name, y) for y in range(height)])
+        _masks[name] = mask
+    return mask
+
+
+def box_mask(width, height):
+    """Solid rectangle mask (for shapes without a pattern)"""
+    return Mask(width, height, [(1 << width) - 1] * height)
+
+
+def overlap(a, ax, ay, b, bx, by):
+    """
+    True if mask a at (ax, ay) and mask b at (bx, by) share an opaque pixel
+
+    Both rows are lined up on their right edges: shifting the one whose right
+    edge is further left by the difference puts equal screen columns on equal
+    bits, so one AND per shared row decides the hit.
+    """
+    top = ay if ay > by else by
+    bottom = min(ay + a.height, by + b.height)
+    if top >= bottom:
+        return False
+    if ax >= bx + b.width or bx >= ax + a.width:
+        return False
+
+    shift = (ax + a.width) - (bx + b.width)
+    a_rows = a.rows
+    b_rows = b.rows
+    if shift >= 0:
+        for y in range(top, bottom):
+            if a_rows[y - ay] & (b_rows[y - by] << shift):
+                return True
+    else:
+        shift = -shift
+        for y in range(top, bottom):
+            if (a_rows[y - ay] << shift) & b_rows[y - by]:
+                return True
+    return False
@@ -0,0 +1,100 @@
+# display_refresh.py
+# Explicit, frame-locked SSD1306 refresh: auto-refresh off, one refresh per frame, none when idle.
+# Timing runs on ticks.py milliseconds, so a refresh never allocates (monotonic_ns() would).
+from ticks import ticks_ms, ticks_add, ticks_diff
+
+
+class RefreshController:
+    """
+    Owns display refreshes once auto_refresh is turned off
+    Provides:
+        - show(group) → switch root_group and mark the frame dirty
+        - mark_dirty() → something on screen changed
+        - refresh() → push the frame if dirty (call once per frame)
+    The target frame rate adapts to the measured I2C transfer time.
+    """
+
+    def __init__(self, display, target_fps=30, min_fps=5, max_fps=60, headroom=0.8, arbiter=None):
+        """
+        Args:
+            display: displayio display (SSD1306)
+            target_fps: Starting target frame rate (default: 30)
+            min_fps: Lowest rate the adaptation may choose (default: 5)
+            max_fps: Highest rate the adaptation may choose (default: 60)
+            headroom: Fraction of the measured max rate to target (default: 0.8)
+            arbiter: BusArbiter for the shared I2C bus (optional)
+        """
+        self.display = display
+        self.display.auto_refresh = False
+
+        self.target_fps = target_fps
+        self.min_fps = min_fps
+        self.max_fps = max_fps
+        self.headroom = headroom
+        self.arbiter = arbiter
+
+        self.dirty = True
+        self._last_refresh = ticks_ms()
+
+        # stats
+        self.refreshes = 0
+        self.skipped = 0     # nothing changed
+        self.dropped = 0     # display.refresh() gave up to catch up
+        self._bus_x8 = 0     # smoothed time spent inside display.refresh(), ms * 8
+
+    def show(self, group):
+        """Make group the visible root group"""
+        if self.display.root_group is not group:
+            self.display.root_group = group
+            self.mark_dirty()
+
+    def mark_dirty(self):
+        self.dirty = True
+        if self.arbiter:
+            self.arbiter.display_pending = True  # sensor reads wait for this frame
+
+    def refresh(self, force=False):
+        """Push the frame if anything changed. Returns True if the panel was updated"""
+        if not (self.dirty or force):
+            self.skipped += 1
+            return False
+
+        now = ticks_ms()
+        # After an idle stretch the minimum-rate check would raise; skip it for this frame
+        idle = ticks_diff(now, self._last_refresh) * self.min_fps > 1000
+        min_fps = 0 if idle else self.min_fps
+
+        # refresh() sleeps until 1/target_fps after the previous frame; don't count that as bus time
+        next_frame = ticks_add(self._last_refresh, 1000 // self.target_fps)
+        expected_wait = max(0, ticks_diff(next_frame, now))
+
+        updated = self.display.refresh(target_frames_per_second=self.target_fps,
+                                       minimum_frames_per_second=min_fps)
+        done = ticks_ms()
+        if self.arbiter:
+            self.arbiter.display_done(now, done, updated)
+        if not updated:
+            self.dropped += 1
+            return False
+
+        self.dirty = False
+        self.refreshes += 1
+        self._last_refresh = done
+        self._adapt(max(0, ticks_diff(done, now) - expected_wait))
+        return True
+
+    @property
+    def bus_ms(self):
+        """Smoothed time spent inside display.refresh()"""
+        return self._bus_x8 / 8
+
+    def _adapt(self, elapsed_ms):
+        """Track bus time (EMA, 1/8 weight) and retarget the frame rate to what the bus sustains"""
+        if self._bus_x8 == 0:
+            self._bus_x8 = elapsed_ms << 3
+        else:
+            self._bus_x8 += elapsed_ms - (self._bus_x8 >> 3)
+
+        if self._bus_x8 > 0:
+            sustainable = int(self.headroom * 8000 / self._bus_x8)
+            self.target_fps = max(self.min_fps, min(self.max_fps, sustainable))
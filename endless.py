@@ -0,0 +1,204 @@
+# endless.py
+# Endless mode: obstacle waves generated one at a time from a seed, shaped by levels.json.
+# Wave i is built from its own PRNG state (seed, i), so any wave can be regenerated on its
+# own - restarts and replays need nothing stored but the seed.
+# Obstacles are spaced by when they reach the player, not just by distance: each one gets
+# its pass plus a whole player jump to itself, whatever the speed and overhead/jumper mix,
+# and the wave is over before the first obstacle to wrap around comes back.
+from game_core import load_levels, SCREEN_WIDTH, PLAYER_WIDTH, OBSTACLE_WIDTH, RESPAWN_GAP
+
+RAMP_WAVES = 30        # waves until the generator reaches its hardest settings
+MAX_WAVES = 9999
+MASK32 = 0xFFFFFFFF
+
+
+def _mix(seed, index):
+    """Scramble (seed, index) into a non-zero 32-bit PRNG state"""
+    x = (seed * 0x9E3779B1 + index * 0x85EBCA77 + 0x165667B1) & MASK32
+    x ^= x >> 15
+    x = (x * 0x2C1B3C6D) & MASK32
+    x ^= x >> 12
+    return x or 0x6D2B79F5
+
+
+class XorShift32:
+    """Tiny deterministic PRNG - same sequence on CircuitPython and CPython"""
+
+    def __init__(self, state):
+        self.state = state & MASK32 or 1
+
+    def next(self):
+        x = self.state
+        x ^= (x << 13) & MASK32
+        x ^= x >> 17
+        x ^= (x << 5) & MASK32
+        self.state = x
+        return x
+
+    def randint(self, low, high):
+        """Integer in [low, high]"""
+        return low + self.next() % (high - low + 1)
+
+    def chance(self, permille):
+        """True with probability permille / 1000"""
+        return self.next() % 1000 < permille
+
+
+def _ramp(a, b, i):
+    """a → b over the first RAMP_WAVES waves (integer maths: identical on every board)"""
+    step = i if i < RAMP_WAVES else RAMP_WAVES
+    return a + (b - a) * step // RAMP_WAVES
+
+
+class WaveProfile:
+    """
+    Ranges the generator draws from, measured on the hand-written levels
+    Provides:
+        - speed_min / speed_max (hundredths of a pixel per tick)
+        - spacing_min / spacing_max, count_min / count_max
+        - y_offsets, overhead_share / jump_share (per mille)
+        - jump_easy / jump_hard → (jump_height, jump_duration) of the first / last level
+    """
+
+    def __init__(self, levels, settings):
+        """
+        Args:
+            levels: Level list from load_levels("easy") (unscaled speeds)
+            settings: game_settings dict
+        """
+        speeds = []
+        spacings = []
+        counts = []
+        y_offsets = []
+        overhead = 0
+        jumping = 0
+        jump_level_obstacles = 0
+        for level in levels:
+            obstacles = level['obstacles']
+            counts.append(len(obstacles))
+            xs = sorted(obs['x'] for obs in obstacles)
+            for i in range(1, len(xs)):
+                spacings.append(xs[i] - xs[i - 1])
+            has_jumpers = False
+            for obs in obstacles:
+                speeds.append(int(obs.get('speed', 1.5) * 100 + 0.5))
+                offset = obs.get('y_offset', 0)
+                if offset:
+                    overhead += 1
+                    if offset not in y_offsets:
+                        y_offsets.append(offset)
+                if obs.get('jumping', False):
+                    jumping += 1
+                    has_jumpers = True
+            if has_jumpers:
+                jump_level_obstacles += len(obstacles)
+        total = len(speeds)
+
+        self.speed_min = min(speeds)
+        self.speed_max = max(speeds)
+        self.spacing_min = min(spacings) if spacings else 60
+        self.spacing_max = max(spacings) if spacings else 120
+        self.count_min = min(counts)
+        self.count_max = max(counts)
+        self.y_offsets = y_offsets
+        self.overhead_share = overhead * 1000 // total
+        # Jumpers only appear in the later levels; use their share within those
+        self.jump_share = jumping * 1000 // jump_level_obstacles if jump_level_obstacles else 0
+
+        first = levels[0]
+        last = levels[-1]
+        self.jump_easy = (first.get('jump_height', settings.get('jump_height', 28)),
+                          first.get('jump_duration', settings.get('jump_duration', 40)))
+        self.jump_hard = (last.get('jump_height', settings.get('jump_height', 28)),
+                          last.get('jump_duration', settings.get('jump_duration', 40)))
+
+
+class EndlessLevels:
+    """
+    List-like endless level source, same interface as level_pack.LevelPack
+    Provides:
+        - levels[i] → wave i as a level dict (generated on demand, only one kept)
+        - settings, max_obstacles, seed
+    Memory is constant: one profile, one cached wave, fixed obstacle capacity.
+    """
+
+    def __init__(self, seed, json_path="levels.json"):
+        """
+        Args:
+            seed: Integer seed - the same seed always yields the same waves
+            json_path: Level data the distributions are measured from
+        """
+        base_levels, self.settings = load_levels("easy", json_path)
+        self.profile = WaveProfile(base_levels, self.settings)
+        self.max_obstacles = self.profile.count_max
+        self.seed = seed
+        self._cached_index = None
+        self._cached_level = None
+
+    def __len__(self):
+        return MAX_WAVES
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += MAX_WAVES
+        if not 0 <= i < MAX_WAVES:
+            raise IndexError("wave index out of range")
+        if i != self._cached_index:
+            self._cached_level = self.wave(i)
+            self._cached_index = i
+        return self._cached_level
+
+    def wave(self, i):
+        """Generate wave i (difficulty ramps over the first RAMP_WAVES waves)"""
+        p = self.profile
+        rng = XorShift32(_mix(self.seed, i))
+
+        # Faster, denser, more jumpers and more obstacles as the ramp goes on,
+        # topping out at the hardest hand-written level
+        speed = _ramp(p.speed_min, p.speed_max, i)
+        spacing = _ramp(p.spacing_max, p.spacing_min, i)
+        upper = _ramp(p.count_min, p.count_max, i)
+        count = rng.randint(p.count_min, upper)
+        jump_share = _ramp(0, p.jump_share, i)
+        jump_duration = _ramp(p.jump_easy[1], p.jump_hard[1], i)
+        player_x = self.settings.get('player_x', 10)
+
+        obstacles = []
+        wraps = []  # (tick it wraps around, speed) per obstacle
+        x = SCREEN_WIDTH
+        free_tick = 0  # first tick the next obstacle may reach the player
+        for n in range(count):
+            obs_speed = speed * rng.randint(90, 110) // 100  # hundredths
+            # Push the obstacle back until the previous one has passed and a jump has landed
+            # (a ground obstacle needs the player in the air, an overhead one on the ground)
+            if (x - player_x - PLAYER_WIDTH) * 100 < free_tick * obs_speed:
+                x = player_x + PLAYER_WIDTH + (free_tick * obs_speed + 99) // 100
+            free_tick = (x + OBSTACLE_WIDTH - player_x) * 100 // obs_speed + 1 + jump_duration
+            wraps.append(((x + OBSTACLE_WIDTH) * 100 // obs_speed + 1, obs_speed))
+
+            obs = {"x": x, "speed": obs_speed / 100}
+            # Keep the first obstacle on the ground so every wave opens with a jump
+            if n and p.y_offsets and rng.chance(p.overhead_share):
+                obs["y_offset"] = p.y_offsets[rng.randint(0, len(p.y_offsets) - 1)]
+            if rng.chance(jump_share):
+                obs["jumping"] = True
+            obstacles.append(obs)
+            x += spacing * rng.randint(90, 120) // 100
+
+        # Wrapped obstacles respawn at SCREEN_WIDTH + count * RESPAWN_GAP. Drop obstacles from
+        # the end until the last one has wrapped (clearing the wave) before any respawn arrives
+        while len(obstacles) > 1:
+            distance = SCREEN_WIDTH + len(obstacles) * RESPAWN_GAP - player_x - PLAYER_WIDTH
+            back = min(tick + distance * 100 // obs_speed for tick, obs_speed in wraps)
+            if wraps[-1][0] < back:
+                break
+            obstacles.pop()
+            wraps.pop()
+
+        return {
+            "level": i + 1,
+            "name": f"Wave{i + 1}",
+            "jump_height": _ramp(p.jump_easy[0], p.jump_hard[0], i),
+            "jump_duration": jump_duration,
+            "obstacles": obstacles,
+        }
@@ -0,0 +1,164 @@
+# frame_profiler.py
+# Opt-in per-phase frame timing: laps and heap deltas go into preallocated arrays (a ring of
+# the last N frames). Laps are timed with ticks.py milliseconds, small ints, so lap() allocates
+# nothing; a lap shorter than 1 ms counts 1000 us when it crosses a tick and 0 otherwise, so
+# the means stay unbiased. precise=True times laps with monotonic_ns() instead - the only
+# sub-millisecond clock on CircuitPython, but it returns a heap-allocated long int, so that
+# fallback measures the per-lap cost once and keeps it out of the per-frame heap figures.
+import gc
+import time
+from array import array
+from boot_profiler import mem_free
+from ticks import ticks_ms, ticks_diff
+
+# Phases - a lap charges the time since the previous lap to one of these
+INPUT = 0
+PHYSICS = 1
+COLLISION = 2
+RENDER = 3
+REFRESH = 4
+SENSOR = 5
+LOGIC = 6
+IDLE = 7
+PHASE_NAMES = ("input", "physics", "collision", "render", "refresh", "sensor", "logic", "idle")
+
+MAX_LAP_US = 0x3FFFFFFF  # largest small int (~18 min)
+
+
+class FrameProfiler:
+    """
+    Ring buffer of per-phase frame timings
+    Provides:
+        - lap(phase) → charge the time since the last lap to phase (allocation-free)
+        - end_frame() → store the frame's laps + heap delta, start the next frame
+        - count(name) → bump an event counter (replaces debug prints)
+        - report() → min / mean / p99 / max per phase plus a frame-time histogram over serial
+        - lap_bytes → heap one precise lap() allocates (subtracted from each frame's heap delta)
+    """
+
+    def __init__(self, frames=128, precise=False):
+        """
+        Args:
+            frames: Frames kept in the ring (default: 128)
+            precise: Time laps with monotonic_ns() for sub-millisecond min / max figures;
+                     each lap then allocates a long int (default: False)
+        """
+        phases = len(PHASE_NAMES)
+        self.size = frames
+        self.precise = precise
+        self.lap = self._lap_ns if precise else self._lap_ticks
+        self.frames = 0                               # frames recorded so far
+        self._laps = array('l', [0] * (frames * phases))
+        self._heap = array('l', [0] * frames)         # bytes allocated per frame (negative: GC ran)
+        self._current = array('l', [0] * phases)
+        self._row = 0
+        self._frame_laps = 0
+        self.events = {}
+        self.lap_bytes = self._measure_lap() if precise else 0
+        self.reset()
+
+    def _measure_lap(self, laps=16):
+        """Heap bytes allocated per precise lap - the long int from monotonic_ns() on the board"""
+        gc.collect()
+        self._last = time.monotonic_ns()
+        before = mem_free()
+        for _ in range(laps):
+            self._lap_ns(IDLE)
+        used = before - mem_free()
+        return used // laps if used > 0 else 0
+
+    def _lap_ticks(self, phase):
+        now = ticks_ms()
+        elapsed = ticks_diff(now, self._last) * 1000
+        self._last = now
+        self._current[phase] = min(self._current[phase] + elapsed, MAX_LAP_US)
+
+    def _lap_ns(self, phase):
+        now = time.monotonic_ns()
+        elapsed = (now - self._last) // 1000
+        self._last = now
+        self._current[phase] = min(self._current[phase] + elapsed, MAX_LAP_US)
+        self._frame_laps += 1
+
+    def end_frame(self):
+        phases = len(PHASE_NAMES)
+        current = self._current
+        laps = self._laps
+        base = self._row * phases
+        for phase in range(phases):
+            laps[base + phase] = current[phase]
+            current[phase] = 0
+
+        # The frame's heap use, minus what this frame's precise laps allocated themselves
+        free = mem_free()
+        self._heap[self._row] = self._free - free - self._frame_laps * self.lap_bytes
+        self._free = free
+        self._frame_laps = 0
+
+        self._row = (self._row + 1) % self.size
+        self.frames += 1
+
+    def count(self, name):
+        self.events[name] = self.events.get(name, 0) + 1
+
+    def reset(self):
+        """Drop recorded frames (e.g. after a loading pause)"""
+        self.frames = 0
+        self._row = 0
+        for phase in range(len(PHASE_NAMES)):
+            self._current[phase] = 0
+        self._frame_laps = 0
+        self._last = time.monotonic_ns() if self.precise else ticks_ms()
+        self._free = mem_free()
+
+    def phase_stats(self, phase):
+        """(min, mean, p99, max) in microseconds over the recorded frames, or None"""
+        n = min(self.frames, self.size)
+        if not n:
+            return None
+        phases = len(PHASE_NAMES)
+        values = sorted(self._laps[row * phases + phase] for row in range(n))
+        p99 = values[min(n - 1, (n * 99) // 100)]
+        return (values[0], sum(values) / n, p99, values[-1])
+
+    def report(self):
+        """Print per-phase stats, heap use and a frame-time histogram"""
+        n = min(self.frames, self.size)
+        print(f"=== Frame Profile (last {n} of {self.frames} frames) ===")
+        if not n:
+            return
+        print(f"{'phase':<10}{'min us':>9}{'mean us':>9}{'p99 us':>9}{'max us':>9}")
+        for phase, name in enumerate(PHASE_NAMES):
+            low, mean, p99, high = self.phase_stats(phase)
+            if high:
+                print(f"{name:<10}{low:>9.0f}{mean:>9.0f}{p99:>9.0f}{high:>9.0f}")
+
+        heap = [self._heap[row] for row in range(n)]
+        gc_frames = sum(1 for delta in heap if delta < 0)
+        allocated = sum(delta for delta in heap if delta > 0)
+        print(f"heap: {allocated / n:.0f} B/frame allocated, GC in {gc_frames} frames")
+        if self.lap_bytes:
+            print(f"  (profiler's own {self.lap_bytes} B per lap excluded - it can still cause GC)")
+
+        # Busy time per frame (everything except idle), log2 buckets in ms
+        phases = len(PHASE_NAMES)
+        buckets = [0] * 8
+        for row in range(n):
+            busy = sum(self._laps[row * phases + phase] for phase in range(phases) if phase != IDLE)
+            bucket = 0
+            limit = 1000
+            while busy >= limit and bucket < len(buckets) - 1:
+                bucket += 1
+                limit <<= 1
+            buckets[bucket] += 1
+        while len(buckets) > 1 and not buckets[-1]:
+            buckets.pop()  # nothing that slow - keep the dump short
+        limit = 1
+        for i, count in enumerate(buckets):
+            bar = "#" * ((count * 30 + n - 1) // n)
+            edge = f"<{limit:>3}" if i < 7 else f">={limit >> 1}"
+            print(f"{edge:>5} ms {count:>5} {bar}")
+            limit <<= 1
+
+        if self.events:
+            print("events:", ", ".join(f"{name}={count}" for name, count in self.events.items()))
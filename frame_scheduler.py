@@ -0,0 +1,90 @@
+# frame_scheduler.py
+# Fixed-timestep scheduler: physics ticks on millisecond-tick deadlines, rendering may drop frames.
+# Ticks are small ints (ticks.py), so scheduling a frame never touches the heap.
+import time
+from ticks import ticks_ms, ticks_add, ticks_diff
+
+
+class FrameScheduler:
+    """
+    Fixed-timestep frame scheduler
+    Provides:
+        - ticks_due() → number of physics ticks to run now
+        - render_due() → True when a frame should be drawn
+        - wait() → sleep until the next tick deadline
+        - remaining_s() → seconds until the next tick deadline (for asyncio.sleep)
+    """
+
+    def __init__(self, tick_ms=30, max_catchup=5):
+        """
+        Args:
+            tick_ms: Physics tick length in milliseconds (default: 30, the old sleep)
+            max_catchup: Most ticks run back-to-back before the backlog is dropped
+        """
+        self.tick_ms = int(tick_ms)
+        self.max_catchup = max_catchup
+
+        # stats
+        self.overruns = 0         # times the backlog was larger than max_catchup
+        self.dropped_frames = 0   # renders skipped because physics was behind
+        self._period_x8 = self.tick_ms << 3   # smoothed frame period, ms * 8
+
+        self.reset()
+
+    def reset(self):
+        """Restart deadlines from now (call after any blocking pause)"""
+        now = ticks_ms()
+        self._next_tick = ticks_add(now, self.tick_ms)
+        self._last_frame = now
+        self._pending_render = False
+
+    def ticks_due(self):
+        """Return how many fixed ticks have elapsed since the last call"""
+        now = ticks_ms()
+        ticks = 0
+        while ticks_diff(now, self._next_tick) >= 0 and ticks < self.max_catchup:
+            self._next_tick = ticks_add(self._next_tick, self.tick_ms)
+            ticks += 1
+
+        # Too far behind: drop the backlog instead of spiralling
+        if ticks_diff(now, self._next_tick) >= 0:
+            self.overruns += 1
+            self._next_tick = ticks_add(now, self.tick_ms)
+
+        if ticks:
+            self._pending_render = True
+        return ticks
+
+    def render_due(self):
+        """True if physics advanced and there is still time left in this tick"""
+        if not self._pending_render:
+            return False
+        self._pending_render = False
+
+        now = ticks_ms()
+        if ticks_diff(now, self._next_tick) >= 0:
+            # Behind schedule - skip drawing, catch up on physics first
+            self.dropped_frames += 1
+            return False
+
+        # Smooth the measured frame period (EMA, 1/8 weight)
+        period = ticks_diff(now, self._last_frame)
+        self._last_frame = now
+        self._period_x8 += period - (self._period_x8 >> 3)
+        return True
+
+    def wait(self):
+        """Sleep until the next tick deadline"""
+        remaining = self.remaining_s()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def remaining_s(self):
+        """Seconds left until the next tick deadline (0 if already due)"""
+        remaining = ticks_diff(self._next_tick, ticks_ms())
+        return remaining / 1000 if remaining > 0 else 0
+
+    @property
+    def frame_period_ms(self):
+        """Measured (smoothed) time between rendered frames"""
+        return self._period_x8 / 8
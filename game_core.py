@@ -0,0 +1,182 @@
+# game_core.py
+# Hardware-free game simulation. run_game() draws it on the OLED,
+# tools/headless_runner.py runs it on a host with no board/displayio.
+import json
+from obstacle_engine import ObstacleEngine
+from jump_table import get_jump_table
+from collision import get_mask
+from frame_profiler import PHYSICS, COLLISION
+
+# Sprite / screen geometry (pixels)
+SCREEN_WIDTH = 128
+PLAYER_WIDTH = 11
+PLAYER_HEIGHT = 11
+OBSTACLE_WIDTH = 12
+OBSTACLE_HEIGHT = 8
+
+# Obstacle respawn spacing and jump window (Hard Mode)
+RESPAWN_GAP = 70
+OBSTACLE_JUMP_MIN_X = 60
+OBSTACLE_JUMP_MAX_X = 90
+
+# Game status returned by step()
+PLAYING = 0
+GAME_OVER = 1
+LEVEL_CLEAR = 2
+
+SPEED_MULTIPLIERS = {"medium": 1.3, "hard": 1.6}
+
+# Load Level Data from JSON
+def load_levels(difficulty="easy", path="levels.json"):
+    """Load level data from levels.json file"""
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+            levels = data['levels']
+            game_settings = data['game_settings']
+
+            # Adjust difficulty
+            multiplier = SPEED_MULTIPLIERS.get(difficulty)
+            if multiplier:
+                for level in levels:
+                    for obs in level.get('obstacles', []):
+                        obs['speed'] = obs.get('speed', 1.5) * multiplier
+
+            return levels, game_settings
+    except Exception as e:
+        print(f"Error loading levels.json: {e}")
+        return [
+            {
+                "level": 1,
+                "name": "Tutorial",
+                "obstacles": [{"x": 128, "speed": 1.5}],
+                "message": "Jump over 1 spaceship!"
+            }
+        ], {
+            "jump_height": 28,
+            "jump_duration": 20,
+            "ground_y": 50,
+            "player_x": 10
+        }
+
+
+class GameState:
+    """All mutable game state - plain numbers only, no displayio objects"""
+
+    def __init__(self, levels, game_settings, level_index=0):
+        """
+        Args:
+            levels: Level list from load_levels()
+            game_settings: Settings dict from load_levels()
+            level_index: Level to start on (default: 0)
+        """
+        self.levels = levels
+        self.settings = game_settings
+
+        self.ground_y = game_settings.get('ground_y', 50)
+        self.player_x = game_settings.get('player_x', 10)
+        self.obstacle_y = self.ground_y + PLAYER_HEIGHT - OBSTACLE_HEIGHT
+
+        # One slot per obstacle of the busiest level
+        max_obstacles = getattr(levels, 'max_obstacles', None)
+        if max_obstacles is None:
+            max_obstacles = max(len(level['obstacles']) for level in levels)
+        self.obstacles = ObstacleEngine(max_obstacles, self.obstacle_y,
+                                        width=OBSTACLE_WIDTH, height=OBSTACLE_HEIGHT,
+                                        screen_width=SCREEN_WIDTH, respawn_gap=RESPAWN_GAP,
+                                        jump_window=(OBSTACLE_JUMP_MIN_X, OBSTACLE_JUMP_MAX_X),
+                                        mask=get_mask("spaceship"))
+        self.player_mask = get_mask("star")
+
+        self.level_index = level_index
+        self.frame = 0
+        load_level(self, level_index)
+
+    @property
+    def level(self):
+        """Current level data"""
+        if self.level_index >= len(self.levels):
+            return self.levels[-1]
+        return self.levels[self.level_index]
+
+    @property
+    def is_last_level(self):
+        return self.level_index >= len(self.levels) - 1
+
+
+def load_level(state, level_index=None):
+    """Reset player and obstacles for a level (default: restart current one)"""
+    if level_index is not None:
+        state.level_index = level_index
+    level_data = state.level
+
+    state.jump_height = level_data.get('jump_height', state.settings.get('jump_height', 28))
+    state.jump_duration = level_data.get('jump_duration', state.settings.get('jump_duration', 40))
+    state.jump_table = get_jump_table(state.jump_height, state.jump_duration)
+
+    state.player_y = state.ground_y
+    state.jumping = False
+    state.jump_timer = 0
+    state.prev_button = True  # a held button must be released before the first jump
+
+    state.status = PLAYING
+    state.obstacles_cleared = 0
+    state.obstacles.load(level_data['obstacles'])
+    state.active_count = state.obstacles.count
+
+
+def advance_level(state):
+    """Move on to the next level. Returns False when every level is done"""
+    if state.is_last_level:
+        return False
+    load_level(state, state.level_index + 1)
+    return True
+
+
+def step(state, button_pressed, profiler=None):
+    """
+    Advance the game by one fixed tick
+
+    Args:
+        state: GameState to mutate
+        button_pressed: True while the jump button is held down
+        profiler: FrameProfiler to charge physics / collision time to (optional)
+
+    Returns:
+        PLAYING, GAME_OVER or LEVEL_CLEAR
+    """
+    if state.status != PLAYING:
+        return state.status
+    state.frame += 1
+
+    # Button Input - jump on the press edge only
+    if button_pressed and not state.prev_button and not state.jumping:
+        state.jumping = True
+        state.jump_timer = state.jump_duration
+    state.prev_button = button_pressed
+
+    # Jump Animation
+    if state.jumping:
+        state.player_y = state.ground_y - state.jump_table[state.jump_timer]
+
+        state.jump_timer -= 1
+        if state.jump_timer <= 0:
+            state.jumping = False
+            state.player_y = state.ground_y
+
+    # Obstacle Movement, Jumping and Wrap-around (batched)
+    cleared = state.obstacles.step()
+    if cleared:
+        state.obstacles_cleared += cleared
+        if state.obstacles_cleared >= state.active_count:
+            state.status = LEVEL_CLEAR
+    if profiler is not None:
+        profiler.lap(PHYSICS)
+
+    # Collision Detection (pixel-exact, sprite masks)
+    if state.obstacles.hits(state.player_mask, state.player_x, state.player_y):
+        state.status = GAME_OVER
+    if profiler is not None:
+        profiler.lap(COLLISION)
+
+    return state.status
@@ -1,343 +1,298 @@
 # game_easy.py 
-import time
+import asyncio
+import gc
 import board
 import digitalio
 import displayio
 import i2cdisplaybus
 import adafruit_displayio_ssd1306
-from adafruit_display_text import label
-import terminalio
-import json
+from text_cache import TextCache
+from frame_scheduler import FrameScheduler
+from display_refresh import RefreshController
+import game_core
+from game_core import load_levels  # re-exported for existing callers
+from level_pack import load_level_pack
+from runtime import Runtime
+from timeline import Timeline
+from frame_profiler import INPUT, RENDER, LOGIC, IDLE
+import sprites
 
-# Load Level Data from JSON 
-def load_levels(difficulty="easy"):
-    """Load level data from levels.json file"""
-    try:
-        with open('levels.json', 'r') as f:
-            data = json.load(f)
-            levels = data['levels']
-            game_settings = data['game_settings']
-            
-            # Adjust difficulty
-            if difficulty == "medium":
-                for level in levels:
-                    for obs in level.get('obstacles', []):
-                        obs['speed'] = obs.get('speed', 1.5) * 1.3
-            elif difficulty == "hard":
-                for level in levels:
-                    for obs in level.get('obstacles', []):
-                        obs['speed'] = obs.get('speed', 1.5) * 1.6
-            
-            return levels, game_settings
-    except Exception as e:
-        print(f"Error loading levels.json: {e}")
-        return [
-            {
-                "level": 1,
-                "name": "Tutorial",
-                "obstacles": [{"x": 128, "speed": 1.5}],
-                "message": "Jump over 1 spaceship!"
-            }
-        ], {
-            "jump_height": 28,
-            "jump_duration": 20,
-            "ground_y": 50,
-            "player_x": 10
-        }
+# Message screens: (text, x, duration_ms)
+GAME_OVER_MESSAGES = (("GAME OVER", 38, 1800), ("click to restart", 5, 1000))
+LEVEL_CLEAR_MESSAGES = (("GOOD JOB!", 38, 2000),)
+NEXT_LEVEL_PAUSE = (("", 15, 500),)
+ENDING_MESSAGES = (
+    ("CONGRATS!", 38, 2000),
+    ("It's the time", 10, 3000),
+    ("Return to your world.", 0, 3000),
+    ("life still goes on", 5, 3000),
+)
+
+# Presses in the first moments of GAME OVER are leftovers from play, not restarts
+RESTART_GUARD_MS = 300
+
+# Transition phases (what the loop does while the simulation is stopped)
+PHASE_PLAY = 0
+PHASE_GAME_OVER = 1
+PHASE_LEVEL_CLEAR = 2
+PHASE_NEXT_LEVEL = 3
+PHASE_ENDING = 4
 
-def run_game(display, button, accel_monitor=None, difficulty="easy"):
-    """Main game function - called from main.py"""
+def run_game(display, inputs, accel_monitor=None, difficulty="easy", refresher=None,
+             profiler=None, seed=None, recorder=None):
+    """Blocking entry point - runs run_game_async with its own input / sensor / render tasks"""
+    # Frame-locked display refresh (auto_refresh off)
+    if refresher is None:
+        refresher = RefreshController(display)
+    runtime = Runtime(inputs, refresher, accel_monitor, profiler=profiler)
+    runtime.run(run_game_async(display, inputs, accel_monitor, difficulty, refresher, profiler,
+                               seed, recorder))
+
+async def run_game_async(display, inputs, accel_monitor=None, difficulty="easy", refresher=None,
+                         profiler=None, seed=None, recorder=None):
+    """
+    Game logic task - called from code.py (inputs: InputManager with a "jump" key)
+    difficulty="endless" plays generated waves from seed instead of levels.json.
+    With an InputRecorder, every physics tick's jump input is logged for replay.
+    Input polling, accel updates and display refreshes belong to the Runtime tasks.
+    With a FrameProfiler, each loop pass is one profiled frame; a "menu" press dumps the report.
+    """
+    if refresher is None:
+        refresher = RefreshController(display)
     
-    LEVELS, GAME_SETTINGS = load_levels(difficulty)
-    print(f"Loaded {len(LEVELS)} levels from configuration ({difficulty} mode)")
+    if difficulty == "endless":
+        from endless import EndlessLevels
+        LEVELS = EndlessLevels(seed or 0)
+        GAME_SETTINGS = LEVELS.settings
+        print(f"Endless mode, seed {LEVELS.seed}")
+    else:
+        LEVELS, GAME_SETTINGS = load_level_pack(difficulty)
+        print(f"Loaded {len(LEVELS)} levels from configuration ({difficulty} mode)")
     
     # Create new display group
     main_group = displayio.Group()
-    display.root_group = main_group
+    refresher.show(main_group)
     
-    # Constants / State
-    ground_y = GAME_SETTINGS.get('ground_y', 50)
-    player_x = GAME_SETTINGS.get('player_x', 10)
-    player_width = 11
-    player_height = 11
-    jump_height = GAME_SETTINGS.get('jump_height', 28)
-    jump_duration = GAME_SETTINGS.get('jump_duration', 40)
-    obstacle_width = 12
-    obstacle_height = 8
+    # Simulation state (positions, timers, level progress)
+    state = game_core.GameState(LEVELS, GAME_SETTINGS)
     
-    # Player Star 11x11 Bitmap
-    player_bitmap = displayio.Bitmap(11, 11, 2)
-    palette = displayio.Palette(2)
-    palette[0] = 0x000000
-    palette[1] = 0xFFFFFF
+    # Sprites - bitmaps, palette and TileGrids come from the shared cache
+    player_tile = sprites.get_tiles("star", 1, "game")[0]
+    player_tile.x = state.player_x
+    player_tile.y = state.ground_y
+    sprites.attach(main_group, player_tile)
     
-    star_pattern = [
-        0,0,0,0,0,1,0,0,0,0,0,
-        0,0,0,0,1,1,1,0,0,0,0,
-        0,0,0,0,1,1,1,0,0,0,0,
-        0,0,0,1,0,1,0,1,0,0,0,
-        0,1,1,0,0,1,0,0,1,1,0,
-        1,1,1,1,1,1,1,1,1,1,1,
-        0,1,1,1,1,1,1,1,1,1,0,
-        0,0,1,1,1,0,1,1,1,0,0,
-        0,0,1,1,0,0,0,1,1,0,0,
-        0,1,1,0,0,0,0,0,1,1,0,
-        0,1,0,0,0,0,0,0,0,1,0
-    ]
-    for y in range(11):
-        for x in range(11):
-            player_bitmap[x, y] = star_pattern[y*11 + x]
+    obstacles = state.obstacles
+    obstacle_tiles = sprites.get_tiles("spaceship", obstacles.capacity, "game")
+    for i, obs_tile in enumerate(obstacle_tiles):
+        obs_tile.x = int(obstacles.x[i])
+        obs_tile.y = int(obstacles.y[i])
+        sprites.attach(main_group, obs_tile)
     
-    player_tile = displayio.TileGrid(player_bitmap, pixel_shader=palette, x=player_x, y=ground_y)
-    main_group.append(player_tile)
+    def render():
+        """Copy simulation positions onto the display tiles; marks the frame dirty if anything moved"""
+        moved = player_tile.y != state.player_y
+        player_tile.y = state.player_y
+        for i in range(len(obstacle_tiles)):
+            tile = obstacle_tiles[i]
+            x = int(obstacles.x[i])
+            y = int(obstacles.y[i])
+            if tile.x != x or tile.y != y:
+                tile.x = x
+                tile.y = y
+                moved = True
+        if moved:
+            refresher.mark_dirty()
     
-    # Obstacle Bitmap
-    obstacle_bitmap = displayio.Bitmap(12, 8, 2)
+    def level_title():
+        level_data = state.level
+        return f"Lv{level_data['level']}:{level_data['name']}"
     
-    spaceship_pattern = [
-        0,0,0,0,1,1,1,0,0,0,0,0,
-        0,0,0,1,1,1,1,1,0,0,0,0,
-        0,0,1,1,1,1,1,1,1,0,0,0,
-        0,1,1,1,1,1,1,1,1,1,1,0,
-        1,1,1,1,1,1,1,1,1,1,1,1,
-        0,1,1,1,1,1,1,1,1,1,1,0,
-        0,0,1,1,1,1,1,1,1,0,0,0,
-        0,0,0,1,1,1,0,0,1,1,0,0
-    ]
-    for oy in range(8):
-        for ox in range(12):
-            obstacle_bitmap[ox, oy] = spaceship_pattern[oy * 12 + ox]
+    # HUD title and status line - every string is rendered once, then swapped in
+    # (titles are capped so endless waves don't pile up bitmaps)
+    title_text = TextCache(x=0, y=5, limit=2)
+    main_group.append(title_text.group)
     
-    obstacle_y = ground_y + player_height - obstacle_height
+    message_text = TextCache(x=15, y=35)
+    main_group.append(message_text.group)
+    for steps in (GAME_OVER_MESSAGES, LEVEL_CLEAR_MESSAGES):
+        for text, x, _ in steps:
+            message_text.add(text, text, x)
     
-    max_obstacles = max(len(level['obstacles']) for level in LEVELS)
-    obstacles = []
-    for i in range(max_obstacles):
-        obs_tile = displayio.TileGrid(obstacle_bitmap, pixel_shader=palette, x=300, y=obstacle_y)
-        main_group.append(obs_tile)
-        obstacles.append({
-            'tile': obs_tile, 
-            'x': 300.0, 
-            'speed': 1.5,
-            'can_jump': False,
-            'jumping': False,
-            'jump_timer': 0,
-            'jump_duration': 20,
-            'jump_height': 15,
-            'base_y': obstacle_y
-        })
+    def show_title():
+        """Swap the HUD to this level's title, rendering it on level load"""
+        index = state.level_index
+        if index not in title_text:
+            title_text.add(index, level_title())
+            if state.is_last_level:
+                for text, x, _ in ENDING_MESSAGES:
+                    message_text.add(text, text, x)
+        if title_text.show(index):
+            refresher.mark_dirty()
     
-    # Score and Game Status
-    current_level_index = 0
-    obstacles_cleared = 0
-    game_won = False
+    def show_message(text):
+        """Swap the status message ("" clears it); the render task pushes it"""
+        if text:
+            changed = message_text.show(text)
+        else:
+            changed = message_text.current is not None
+            message_text.hide()
+        if changed:
+            refresher.mark_dirty()
     
-    def get_current_level():
-        """Get current level data"""
-        if current_level_index >= len(LEVELS):
-            return LEVELS[-1]
-        return LEVELS[current_level_index]
+    show_title()
     
-    def load_level(level_data):
-        """Load level configuration"""
-        nonlocal jump_height, jump_duration
-        if 'jump_height' in level_data:
-            jump_height = level_data['jump_height']
-        if 'jump_duration' in level_data:
-            jump_duration = level_data['jump_duration']
-        
-        for i, obs in enumerate(obstacles):
-            if i < len(level_data['obstacles']):
-                obs_data = level_data['obstacles'][i]
-                obs['x'] = float(obs_data['x'])
-                obs['speed'] = obs_data.get('speed', 1.5)
-                obs['tile'].x = int(obs['x'])
-                obs['can_jump'] = obs_data.get('jumping', False)
-                obs['jumping'] = False
-                obs['jump_timer'] = 0
-                y_offset = obs_data.get('y_offset', 0)
-                obs['base_y'] = obstacle_y + y_offset
-                obs['tile'].y = obs['base_y']
-            else:
-                obs['x'] = 500.0
-                obs['tile'].x = 500
-                obs['can_jump'] = False
-                obs['base_y'] = obstacle_y
+    # Input State - presses queued by InputManager, consumed by the next physics tick
+    jump_requested = False
+    progress_shown = -1  # obstacles cleared as last drawn on the LED progress bar
+    if recorder is not None:
+        recorder.start(difficulty, state.level_index, seed)
     
-    level_data = get_current_level()
-    load_level(level_data)
+    # Fixed 30 ms physics tick; read scheduler.frame_period_ms / overruns for timing
+    scheduler = FrameScheduler(tick_ms=30)
     
-    score_label = label.Label(terminalio.FONT,
-                             text=f"Lv{level_data['level']}:{level_data['name']}",
-                             color=0xFFFFFF, x=0, y=5)
-    main_group.append(score_label)
+    print(f"=== Star Jump Game ({difficulty.upper()}) ===")
     
-    game_over_label = label.Label(terminalio.FONT, text="", color=0xFFFFFF, x=15, y=35)
-    main_group.append(game_over_label)
+    # Transitions run off a deadline-driven timeline, so input / LEDs stay live
+    phase = PHASE_PLAY
+    timeline = None
     
-    # Game State Variables 
-    jumping = False
-    jump_timer = 0
-    game_over = False
-    prev_button_state = True
+    def start_phase(new_phase, steps, loop=False):
+        nonlocal phase, timeline
+        phase = new_phase
+        timeline = Timeline(steps, loop)
+        # GC policy: collect while a message is up, so play never pauses for one
+        gc.collect()
+        timeline.start()
     
-    debug = True
-    print(f"=== Star Jump Game ({difficulty.upper()}) ===")
+    # Steady-state frames allocate nothing (ticks are small ints, obstacles live in
+    # preallocated arrays, loops index instead of slicing / enumerate, and the frame
+    # yield is inlined - calling an async helper would build a coroutine object), so
+    # starting from a collected heap keeps the automatic GC out of the level.
+    # tools/bench.py --alloc checks a full play pass, render path included.
+    gc.collect()
+    scheduler.reset()
+    if profiler is not None:
+        profiler.reset()
     
     # Main Game Loop
-    while True:
-        # Game Over Handling
-        if game_over:
-            # Turn on red light on Game Over
-            if accel_monitor:
-                accel_monitor.set_red()
-            
-            game_over_label.text = "GAME OVER"
-            game_over_label.x = 38
-            time.sleep(1.8)
-            
-            game_over_label.text = "click to restart"
-            game_over_label.x = 5
-            time.sleep(1)
-            
-            if not button.value:
-                # Clear red light when restarting
-                if accel_monitor:
-                    accel_monitor.clear_override()
-                
-                game_over = False
-                game_won = False
-                obstacles_cleared = 0
-                
-                level_data = get_current_level()
-                load_level(level_data)
-                
-                game_over_label.text = ""
-                score_label.text = f"Lv{level_data['level']}:{level_data['name']}"
-                
-                print("Restarting CURRENT LEVEL!")
-            
-            time.sleep(0.1)
-            continue
+    # The game owns the LEDs while it runs (progress bar, red flash); hand them back to
+    # pickup detection however it ends - the ending, an exception or a cancelled task
+    try:
+        while True:
+            if profiler is not None and inputs.pressed("menu"):
+                profiler.report()
         
-        # Level Complete Handling
-        if game_won:
-            if current_level_index >= 9:
-                game_over_label.text = "CONGRATS!"
-                game_over_label.x = 38
-                time.sleep(2)
-                
-                game_over_label.text = "It's the time"
-                game_over_label.x = 10
-                time.sleep(3)
-                
-                game_over_label.text = "Return to your world."
-                game_over_label.x = 0
-                time.sleep(3)
-                
-                game_over_label.text = "life still goes on"
-                game_over_label.x = 5
-                time.sleep(3)
-                
-                print("All levels finished.")
-                break  # Exit game, return to main menu
-            
-            game_over_label.text = "GOOD JOB!"
-            game_over_label.x = 38
-            time.sleep(2)
+            if phase != PHASE_PLAY:
+                step = timeline.update()
+                if step:
+                    show_message(step[0])
             
-            current_level_index += 1
-            obstacles_cleared = 0
-            game_won = False
-            game_over_label.text = ""
+                if phase == PHASE_GAME_OVER:
+                    # Any fresh press restarts; a held button counts once the prompt is up
+                    pressed = inputs.pressed("jump")
+                    held = timeline.index > 0 and inputs.is_down("jump")
+                    if timeline.elapsed_ms() >= RESTART_GUARD_MS and (pressed or held):
+                        # Clear red light when restarting
+                        if accel_monitor:
+                            accel_monitor.clear_override()
+                    
+                        game_core.load_level(state)
+                        render()
+                        progress_shown = -1
+                    
+                        show_title()
+                        show_message("")
+                    
+                        print("Restarting CURRENT LEVEL!")
+                        gc.collect()  # clean heap going into the level
+                        phase = PHASE_PLAY
+                        scheduler.reset()
             
-            level_data = get_current_level()
-            load_level(level_data)
-            score_label.text = f"Lv{level_data['level']}:{level_data['name']}"
-            print(f"Next Level {level_data['level']}")
-            time.sleep(0.5)
-            continue
-        
-        # Button Input
-        button_pressed = not button.value
-        button_just_pressed = (not prev_button_state and button_pressed)
-        prev_button_state = button_pressed
-        
-        if button_just_pressed and not jumping:
-            jumping = True
-            jump_timer = jump_duration
-            if debug:
-                print("JUMP!")
-        
-        # Jump Animation
-        if jumping:
-            progress = 1 - (jump_timer / jump_duration)
-            height = jump_height * (1 - (2 * progress - 1) ** 2)
-            player_tile.y = int(ground_y - height)
+                elif timeline.done:
+                    if phase == PHASE_ENDING:
+                        print("All levels finished.")
+                        break  # Exit game, return to main menu
+                
+                    if phase == PHASE_LEVEL_CLEAR:
+                        game_core.advance_level(state)
+                        render()
+                        show_title()
+                        print(f"Next Level {state.level['level']}")
+                        start_phase(PHASE_NEXT_LEVEL, NEXT_LEVEL_PAUSE)
+                    else:
+                        phase = PHASE_PLAY
+                        scheduler.reset()
             
-            jump_timer -= 1
-            if jump_timer <= 0:
-                jumping = False
-                player_tile.y = ground_y
+                # Keep the tick clock running so the loop still wakes once per frame
+                scheduler.ticks_due()
+                if profiler is not None:
+                    profiler.lap(LOGIC)
+                    profiler.end_frame()
+                await asyncio.sleep(scheduler.remaining_s())
+                if profiler is not None:
+                    profiler.lap(IDLE)
+                continue
         
-        # Obstacle Movement
-        level_data = get_current_level()
-        active_obstacles = obstacles[:len(level_data['obstacles'])]
+            # Button Input (queued by the runtime's input task)
+            if inputs.pressed("jump"):
+                jump_requested = True
+            button_pressed = inputs.is_down("jump")
+            if profiler is not None:
+                profiler.lap(INPUT)
         
-        for obs in active_obstacles:
-            obs['x'] -= obs['speed']
-            obs['tile'].x = int(obs['x'])
-            
-            # Obstacle Jumping (Hard Mode)
-            if obs.get('can_jump', False):
-                if not obs['jumping'] and obs['x'] < 90 and obs['x'] > 60:
-                    obs['jumping'] = True
-                    obs['jump_timer'] = obs['jump_duration']
-                
-                if obs['jumping']:
-                    progress = 1 - (obs['jump_timer'] / obs['jump_duration'])
-                    height = obs['jump_height'] * (1 - (2 * progress - 1) ** 2)
-                    obs['tile'].y = int(obs['base_y'] - height)
-                    
-                    obs['jump_timer'] -= 1
-                    if obs['jump_timer'] <= 0:
-                        obs['jumping'] = False
-                        obs['tile'].y = obs['base_y']
+            # Physics - fixed ticks, independent of how long rendering takes
+            for _ in range(scheduler.ticks_due()):
+                if jump_requested:
+                    state.prev_button = False  # a queued press is always a fresh edge
+                was_jumping = state.jumping
+                jump_input = button_pressed or jump_requested
+                if recorder is not None:
+                    recorder.record(jump_input and not state.prev_button)
+                status = game_core.step(state, jump_input, profiler)
+                jump_requested = False
             
-            if obs['x'] < -obstacle_width:
-                obstacles_cleared += 1
-                obs['x'] = 128 + len(active_obstacles)*70
-                obs['jumping'] = False
-                obs['jump_timer'] = 0
-                obs['tile'].y = obs['base_y']
-                
-                if obstacles_cleared >= len(active_obstacles):
-                    game_won = True
+                if profiler is not None and state.jumping and not was_jumping:
+                    profiler.count("jump")
+                if status != game_core.PLAYING:
+                    break
         
-        # Collision Detection
-        collision = False
+            # LED progress bar - only redrawn when an obstacle is cleared (the sensor task shows it)
+            if accel_monitor and state.obstacles_cleared != progress_shown and \
+                    state.status != game_core.GAME_OVER:
+                progress_shown = state.obstacles_cleared
+                accel_monitor.show_progress(progress_shown, state.active_count)
         
-        for obs in active_obstacles:
-            player_left = player_x + 3
-            player_right = player_x + player_width - 3
-            player_top = player_tile.y + 2
-            player_bottom = player_tile.y + player_height - 2
-            
-            obs_left = int(obs['x']) + 2
-            obs_right = int(obs['x']) + obstacle_width - 2
-            obs_top = obs['tile'].y + 1
-            obs_bottom = obs['tile'].y + obstacle_height - 1
-            
-            if (player_right > obs_left and player_left < obs_right and
-                player_bottom > obs_top and player_top < obs_bottom):
-                collision = True
-                break
+            # Render - push positions to the tiles, the render task sends the frame
+            if scheduler.render_due() or state.status != game_core.PLAYING:
+                render()
+            if profiler is not None:
+                profiler.lap(RENDER)
         
-        if collision:
-            game_over = True
-            print("Game Over!")
+            # Game Over / Level Complete - hand over to the transition timeline
+            if state.status == game_core.GAME_OVER:
+                print("Game Over!")
+                # Turn on red light on Game Over
+                if accel_monitor:
+                    accel_monitor.set_red()
+                if recorder is not None:
+                    recorder.save()  # the log so far ends on this collision
+                start_phase(PHASE_GAME_OVER, GAME_OVER_MESSAGES, loop=True)
+            elif state.status == game_core.LEVEL_CLEAR:
+                if state.is_last_level:
+                    start_phase(PHASE_ENDING, ENDING_MESSAGES)
+                else:
+                    start_phase(PHASE_LEVEL_CLEAR, LEVEL_CLEAR_MESSAGES)
         
-        time.sleep(0.03)
+            # Close the profiled frame and yield until the next tick deadline
+            if profiler is not None:
+                profiler.end_frame()
+            await asyncio.sleep(scheduler.remaining_s())
+            if profiler is not None:
+                profiler.lap(IDLE)
+    finally:
+        if accel_monitor:
+            accel_monitor.clear_override()
 
 # For standalone testing
 if __name__ == "__main__":
@@ -353,8 +308,7 @@ if __name__ == "__main__":
     display_bus = i2cdisplaybus.I2CDisplayBus(i2c_bus, device_address=0x3c)
     display = adafruit_displayio_ssd1306.SSD1306(display_bus, width=128, height=64)
     
-    button = digitalio.DigitalInOut(board.D1)
-    button.direction = digitalio.Direction.INPUT
-    button.pull = digitalio.Pull.UP
+    from input_events import InputManager
+    inputs = InputManager({"jump": board.D1})
     
-    run_game(display, button, difficulty="easy")
+    run_game(display, inputs, difficulty="easy")
@@ -0,0 +1,146 @@
+# input_events.py
+# One input subsystem for the menu button, game button and rotary encoder.
+# Buttons are scanned by keypad.Keys in the background (polled + debounced here if keypad is missing);
+# press / release edges come out of a queue with timestamps - nothing ever sleeps.
+# The queue is preallocated (key / state / time arrays), so presses during play don't allocate.
+from array import array
+from ticks import ticks_ms, ticks_diff
+
+try:
+    import keypad
+except ImportError:
+    keypad = None
+
+
+class InputManager:
+    """
+    Timestamped button events + encoder steps
+    Provides:
+        - poll() → pull new edges into the queue (call once per loop pass)
+        - events() → all queued (key, pressed, timestamp_ms) tuples
+        - pressed(key) → consume the next press of one key
+        - is_down(key) → current debounced state
+        - steps() → net encoder movement since the last call
+    """
+
+    def __init__(self, buttons, encoder=None, interval=0.005, debounce_ms=20, max_events=16):
+        """
+        Args:
+            buttons: Dict of key name -> pin, e.g. {"menu": board.D6, "jump": board.D1}
+            encoder: RotaryEncoder to service from poll() (optional)
+            interval: keypad scan interval in seconds (default: 0.005)
+            debounce_ms: Debounce for the polled fallback (default: 20)
+            max_events: Queue length before the oldest events drop (default: 16)
+        """
+        self.names = list(buttons)
+        self.encoder = encoder
+        self.max_events = max_events
+        self._count = 0
+        self._keys_q = bytearray(max_events)        # key index
+        self._pressed_q = bytearray(max_events)     # 1 = press, 0 = release
+        self._time_q = array("l", [0] * max_events)  # ticks_ms
+        self._down = [False] * len(self.names)
+        self.dropped = 0
+
+        pins = [buttons[name] for name in self.names]
+        if keypad is not None:
+            # Active-low buttons with internal pull-ups, scanned in the background
+            self._keys = keypad.Keys(pins, value_when_pressed=False, pull=True, interval=interval)
+            self._event = keypad.Event()
+        else:
+            import digitalio
+            self._keys = None
+            self._pins = []
+            for pin in pins:
+                io = digitalio.DigitalInOut(pin)
+                io.switch_to_input(pull=digitalio.Pull.UP)
+                self._pins.append(io)
+            self._debounce_ms = debounce_ms
+            self._since = [None] * len(pins)
+
+    def _push(self, key, pressed, timestamp_ms):
+        n = self._count
+        if n >= self.max_events:
+            self._keep(0, -1)  # drop the oldest
+            self.dropped += 1
+            n = self._count
+        self._keys_q[n] = key
+        self._pressed_q[n] = pressed
+        self._time_q[n] = timestamp_ms
+        self._count = n + 1
+        self._down[key] = pressed
+
+    def _keep(self, upto, key):
+        """Compact the queue in place, dropping events 0..upto of key (-1 = any key)"""
+        keys = self._keys_q
+        pressed = self._pressed_q
+        times = self._time_q
+        w = 0
+        for j in range(self._count):
+            if j > upto or (key >= 0 and keys[j] != key):
+                keys[w] = keys[j]
+                pressed[w] = pressed[j]
+                times[w] = times[j]
+                w += 1
+        self._count = w
+
+    def poll(self):
+        """Collect new button edges and service the encoder"""
+        if self.encoder is not None:
+            self.encoder.update()
+
+        if self._keys is not None:
+            event = self._event
+            while self._keys.events.get_into(event):
+                self._push(event.key_number, event.pressed, event.timestamp)
+            return
+
+        # Fallback: poll pins, accept a change once it has been stable for debounce_ms
+        now = ticks_ms()
+        pins = self._pins
+        for i in range(len(pins)):
+            raw = not pins[i].value
+            if raw == self._down[i]:
+                self._since[i] = None
+            elif self._since[i] is None:
+                self._since[i] = now
+                if not self._debounce_ms:
+                    self._push(i, raw, now)
+            elif ticks_diff(now, self._since[i]) >= self._debounce_ms:
+                self._since[i] = None
+                self._push(i, raw, now)
+
+    def events(self):
+        """Pop and return every queued (key, pressed, timestamp_ms) event"""
+        queue = [(self.names[self._keys_q[i]], bool(self._pressed_q[i]), self._time_q[i])
+                 for i in range(self._count)]
+        self._count = 0
+        return queue
+
+    def pressed(self, key):
+        """Consume the oldest queued press of key. Returns True if there was one"""
+        k = self.names.index(key)
+        keys = self._keys_q
+        pressed = self._pressed_q
+        for i in range(self._count):  # index loop: no iterator object per call
+            if keys[i] == k and pressed[i]:
+                # Drop this press and the key's older events; keep everything else
+                self._keep(i, k)
+                return True
+        return False
+
+    def is_down(self, key):
+        """Debounced current state of key"""
+        return self._down[self.names.index(key)]
+
+    def clear(self):
+        """Forget queued events (e.g. when switching screens)"""
+        self._count = 0
+        if self.encoder is not None:
+            self.encoder.get_step()
+
+    def steps(self):
+        """Net encoder steps since the last call"""
+        if self.encoder is None:
+            return 0
+        return self.encoder.get_step()
@@ -0,0 +1,155 @@
+# input_recorder.py
+# Bit-packed input logs: one bit per physics tick, so a whole session fits in a few hundred bytes.
+# The game's outcome depends only on which tick a jump starts, so replaying the bits through
+# game_core reproduces every collision and level clear exactly - on the board or on a host.
+#
+# Layout (little-endian):
+#   header   <4sBBHII   magic, version, difficulty, start level index, seed, tick count
+#   bits     tick i is bit (i & 7) of byte (i >> 3)
+import binascii
+import struct
+
+import game_core
+
+MAGIC = b'SJR1'
+VERSION = 1
+HEADER = '<4sBBHII'
+HEADER_SIZE = struct.calcsize(HEADER)
+
+DIFFICULTIES = ("easy", "medium", "hard", "endless")
+
+# Replay event kinds
+COLLISION = "collision"
+CLEAR = "clear"
+
+
+class InputRecorder:
+    """
+    Records the jump input of every physics tick into a preallocated buffer
+    Provides:
+        - start(difficulty, level_index, seed) → begin a new session
+        - record(edge) → log one tick (True when the tick starts a fresh press)
+        - to_bytes() → header + packed bits
+        - save(path) → write the log to flash (printed as hex if the filesystem is read-only)
+        - ticks, truncated
+    record() never allocates; once the buffer is full further ticks are dropped.
+    """
+
+    def __init__(self, max_ticks=16384):
+        """
+        Args:
+            max_ticks: Buffer size in ticks (default: 16384, ~8 minutes at 30 ms, 2 KB)
+        """
+        self.max_ticks = max_ticks
+        self._bits = bytearray((max_ticks + 7) // 8)
+        self.difficulty = 0
+        self.level_index = 0
+        self.seed = 0
+        self.ticks = 0
+        self.truncated = False
+
+    def start(self, difficulty="easy", level_index=0, seed=0):
+        """Clear the buffer and stamp the session header"""
+        self.difficulty = DIFFICULTIES.index(difficulty)
+        self.level_index = level_index
+        self.seed = seed or 0
+        self.ticks = 0
+        self.truncated = False
+        bits = self._bits
+        for i in range(len(bits)):
+            bits[i] = 0
+
+    def record(self, edge):
+        """Log one tick; edge is the press edge game_core.step() would see"""
+        i = self.ticks
+        if i >= self.max_ticks:
+            self.truncated = True
+            return
+        if edge:
+            self._bits[i >> 3] |= 1 << (i & 7)
+        self.ticks = i + 1
+
+    def to_bytes(self):
+        header = struct.pack(HEADER, MAGIC, VERSION, self.difficulty, self.level_index,
+                             self.seed, self.ticks)
+        return header + bytes(self._bits[:(self.ticks + 7) // 8])
+
+    def save(self, path="/replay.sjr"):
+        """Write the log to path; when CIRCUITPY is read-only (USB attached), print it instead"""
+        data = self.to_bytes()
+        try:
+            with open(path, 'wb') as f:
+                f.write(data)
+        except OSError:
+            print(f"Replay ({self.ticks} ticks): {binascii.hexlify(data).decode()}")
+            return False
+        print(f"Replay saved to {path} ({self.ticks} ticks)")
+        return True
+
+
+class Recording:
+    """
+    A decoded input log
+    Provides:
+        - difficulty, level_index, seed, ticks
+        - bit(i) → the recorded edge of tick i
+        - load_levels(json_path, pack_path) → (levels, settings) the session was played on
+    """
+
+    def __init__(self, data):
+        """
+        Args:
+            data: bytes from InputRecorder.to_bytes() / a saved .sjr file
+        """
+        magic, version, difficulty, self.level_index, self.seed, self.ticks = \
+            struct.unpack_from(HEADER, data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not an input recording")
+        if len(data) < HEADER_SIZE + (self.ticks + 7) // 8:
+            raise ValueError("Input recording is truncated")
+        self.difficulty = DIFFICULTIES[difficulty]
+        self._bits = data[HEADER_SIZE:]
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls(f.read())
+
+    def bit(self, i):
+        return (self._bits[i >> 3] >> (i & 7)) & 1
+
+    def load_levels(self, json_path="levels.json", pack_path="levels.bin"):
+        """Level list and settings for this session's difficulty (and seed, for endless)"""
+        if self.difficulty == "endless":
+            from endless import EndlessLevels
+            levels = EndlessLevels(self.seed, json_path)
+            return levels, levels.settings
+        # Same source as the game: the pack's fixed-point speeds, not levels.json's
+        from level_pack import load_level_pack
+        return load_level_pack(self.difficulty, json_path, pack_path)
+
+
+def replay(recording, levels, settings):
+    """
+    Feed a recording through game_core at full speed
+
+    Restarts after a collision and advances after a clear, the way the game does,
+    so each recorded tick lands on the same game tick it was played on.
+
+    Returns:
+        List of (tick, kind, level number) for every collision and level clear
+    """
+    state = game_core.GameState(levels, settings, recording.level_index)
+    events = []
+    for i in range(recording.ticks):
+        # The bit is the press edge itself, so the held-button history is not needed
+        state.prev_button = False
+        status = game_core.step(state, recording.bit(i))
+        if status == game_core.GAME_OVER:
+            events.append((i, COLLISION, state.level['level']))
+            game_core.load_level(state)
+        elif status == game_core.LEVEL_CLEAR:
+            events.append((i, CLEAR, state.level['level']))
+            if not game_core.advance_level(state):
+                break
+    return events
@@ -0,0 +1,37 @@
+# jump_table.py
+# Precomputed jump parabolas: one integer lift table per (jump_height, jump_duration) pair.
+import math
+from array import array
+
+_tables = {}
+
+
+def get_jump_table(jump_height, jump_duration):
+    """
+    Return the cached lift table for a jump, building it on first use
+
+    table[timer] is how many pixels above its base a sprite sits while
+    `timer` ticks of the jump remain, so y = base_y - table[timer] matches
+    int(base_y - jump_height * (1 - (2 * progress - 1) ** 2)).
+    table[0] is 0 (on the ground).
+
+    Args:
+        jump_height: Apex height in pixels
+        jump_duration: Jump length in ticks
+    """
+    key = (jump_height, jump_duration)
+    table = _tables.get(key)
+    if table is None:
+        table = array('h', [0] * (jump_duration + 1))
+        for timer in range(1, jump_duration + 1):
+            progress = 1 - (timer / jump_duration)
+            height = jump_height * (1 - (2 * progress - 1) ** 2)
+            # int() of (base - height) truncates toward zero, i.e. base - ceil(height)
+            table[timer] = math.ceil(height)
+        _tables[key] = table
+    return table
+
+
+def cache_size():
+    """Number of distinct tables built so far"""
+    return len(_tables)
@@ -0,0 +1,180 @@
+# led_engine.py
+# NeoPixel frame buffer: colours go through a gamma/brightness lookup table, only pixels that
+# changed are rewritten, and show() (a bit-banged strip write) is rate-capped and skipped when
+# nothing changed. Effects are functions of elapsed time, advanced by tick() - nothing blocks.
+from ticks import ticks_ms, ticks_add, ticks_diff
+
+
+def gamma_table(brightness=0.3, gamma=2.6):
+    """256-entry table: perceptual level 0-255 → strip value, brightness baked in"""
+    return bytes(int((i / 255) ** gamma * 255 * brightness + 0.5) for i in range(256))
+
+
+class LedEngine:
+    """
+    Buffered NeoPixel strip with effects
+    Provides:
+        - set_rgb(i, r, g, b) / fill_rgb(r, g, b) → write the frame (marks changed pixels dirty)
+        - bar(r, g, b, done, total) → progress bar, the last lit pixel partly on
+        - play(effect) / stop() → run a time-based effect (Pulse, Flash)
+        - tick() → advance the effect; show() if anything is dirty and the rate cap allows
+        - flush() → show() now, ignoring the cap
+        - shows → number of strip writes so far
+    """
+
+    def __init__(self, pixels, brightness=0.3, gamma=2.6, max_fps=30):
+        """
+        Args:
+            pixels: neopixel.NeoPixel created with brightness=1.0, auto_write=False
+            brightness: Overall brightness 0.0-1.0, applied through the lookup table
+            gamma: Gamma exponent for the lookup table (default: 2.6)
+            max_fps: Most show() calls per second (default: 30)
+        """
+        self.pixels = pixels
+        self.n = len(pixels)
+        self.lut = gamma_table(brightness, gamma)
+        self.min_show_ms = 1000 // max_fps
+
+        self._frame = bytearray(self.n * 3)        # perceptual colours, 3 bytes per pixel
+        self._dirty = bytearray(b'\x01' * self.n)  # push everything on the first show
+        self._pending = True
+        self._last_show = ticks_add(ticks_ms(), -self.min_show_ms)
+        self.shows = 0
+
+        self.effect = None
+        self._effect_start = 0
+
+    # Frame buffer
+
+    def set_rgb(self, i, r, g, b):
+        frame = self._frame
+        j = i * 3
+        if frame[j] != r or frame[j + 1] != g or frame[j + 2] != b:
+            frame[j] = r
+            frame[j + 1] = g
+            frame[j + 2] = b
+            self._dirty[i] = 1
+            self._pending = True
+
+    def fill_rgb(self, r, g, b):
+        frame = self._frame
+        dirty = self._dirty
+        for i in range(self.n):
+            j = i * 3
+            if frame[j] != r or frame[j + 1] != g or frame[j + 2] != b:
+                frame[j] = r
+                frame[j + 1] = g
+                frame[j + 2] = b
+                dirty[i] = 1
+                self._pending = True
+
+    def bar(self, r, g, b, done, total):
+        """Light done/total of the strip from pixel 0; the boundary pixel is dimmed to the remainder"""
+        lit = done * self.n * 255 // total if total > 0 else 0
+        full = lit // 255
+        part = lit % 255
+        for i in range(self.n):
+            if i < full:
+                self.set_rgb(i, r, g, b)
+            elif i == full:
+                self.set_rgb(i, r * part // 255, g * part // 255, b * part // 255)
+            else:
+                self.set_rgb(i, 0, 0, 0)
+
+    # Effects
+
+    def play(self, effect):
+        """Start an effect from its beginning (replaces the current one)"""
+        self.effect = effect
+        self._effect_start = ticks_ms()
+
+    def stop(self):
+        """Stop the effect; the frame keeps whatever it drew last"""
+        self.effect = None
+
+    # Output
+
+    def tick(self):
+        """Advance the effect, then push dirty pixels if the show() cap allows"""
+        effect = self.effect
+        if effect is None and not self._pending:
+            return  # idle: nothing to draw or send
+        now = ticks_ms()
+        if effect is not None and not effect.render(self, ticks_diff(now, self._effect_start)):
+            self.effect = None
+        if self._pending and ticks_diff(now, self._last_show) >= self.min_show_ms:
+            self._show(now)
+
+    def flush(self):
+        """Push dirty pixels now (e.g. before the program exits)"""
+        if self._pending:
+            self._show(ticks_ms())
+
+    def _show(self, now):
+        pixels = self.pixels
+        frame = self._frame
+        dirty = self._dirty
+        lut = self.lut
+        for i in range(self.n):
+            if dirty[i]:
+                j = i * 3
+                # packed 0xRRGGBB: a small int, where an (r, g, b) tuple would be a heap object
+                pixels[i] = (lut[frame[j]] << 16) | (lut[frame[j + 1]] << 8) | lut[frame[j + 2]]
+                dirty[i] = 0
+        pixels.show()
+        self.shows += 1
+        self._pending = False
+        self._last_show = now
+
+
+class Pulse:
+    """Whole strip breathing between a floor and full colour (triangle wave)"""
+
+    def __init__(self, color, period_ms=1200, floor=64, duration_ms=None):
+        """
+        Args:
+            color: (r, g, b) at the peak
+            period_ms: One breath (default: 1200)
+            floor: Dimmest level, 0-255 of the colour (default: 64)
+            duration_ms: Stop after this long (default: run until replaced)
+        """
+        self.r, self.g, self.b = color
+        self.period_ms = period_ms
+        self.floor = floor
+        self.duration_ms = duration_ms
+
+    def render(self, leds, elapsed):
+        if self.duration_ms is not None and elapsed >= self.duration_ms:
+            return False
+        half = self.period_ms // 2
+        phase = elapsed % self.period_ms
+        ramp = phase if phase < half else self.period_ms - phase   # 0 → half → 0
+        level = self.floor + (255 - self.floor) * ramp // half
+        leds.fill_rgb(self.r * level // 255, self.g * level // 255, self.b * level // 255)
+        return True
+
+
+class Flash:
+    """Whole strip blinking, then left on in the colour"""
+
+    def __init__(self, color, on_ms=200, off_ms=200, count=3):
+        """
+        Args:
+            color: (r, g, b)
+            on_ms / off_ms: Blink timing (default: 200 / 200)
+            count: Blinks before holding the colour (default: 3, None = blink forever)
+        """
+        self.r, self.g, self.b = color
+        self.on_ms = on_ms
+        self.period_ms = on_ms + off_ms
+        self.count = count
+
+    def render(self, leds, elapsed):
+        if self.count is not None and elapsed >= self.count * self.period_ms:
+            leds.fill_rgb(self.r, self.g, self.b)
+            return False
+        if elapsed % self.period_ms < self.on_ms:
+            leds.fill_rgb(self.r, self.g, self.b)
+        else:
+            leds.fill_rgb(0, 0, 0)
+        return True
@@ -0,0 +1,212 @@
+# level_pack.py
+# Compiled binary form of levels.json with the medium/hard speed tables baked in.
+# Levels are read from flash one at a time; the pack is rebuilt when levels.json's content changes.
+#
+# CIRCUITPY is read-only to code.py unless boot.py remounts it, so build the pack on the host
+# and copy it next to levels.json:  python3 level_pack.py  (writes levels.bin)
+# The pack stores a CRC32 of levels.json's bytes, not a timestamp, so a host-built pack
+# still matches on the board.
+#
+# Layout (little-endian):
+#   header   <4sIBB4h   magic, levels.json CRC32, level count, max obstacles,
+#                       jump_height, jump_duration, ground_y, player_x
+#   index    <HH        (offset, length) per level
+#   level    <BB name <hhB   level number, name length, name, jump_height,
+#                            jump_duration (-1 = use game_settings), obstacle count
+#   obstacle <hbBHHH    x, y_offset, flags (bit 0 = jumping), easy/medium/hard speed
+#                       in 1/256 px per tick (obstacle_engine's fixed point)
+import binascii
+import json
+import os
+import struct
+
+from game_core import SPEED_MULTIPLIERS, load_levels
+from obstacle_engine import FIX_ONE, to_fixed
+
+MAGIC = b'LVP3'
+HEADER = '<4sIBB4h'
+INDEX = '<HH'
+LEVEL_HEAD = '<hhB'
+OBSTACLE = '<hbBHHH'
+
+DIFFICULTIES = ("easy", "medium", "hard")
+
+
+def json_crc(json_path="levels.json"):
+    """CRC32 of levels.json's bytes, read in small chunks (no parse, no big buffer)"""
+    crc = 0
+    buf = bytearray(256)
+    view = memoryview(buf)
+    with open(json_path, 'rb') as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            crc = binascii.crc32(view[:n], crc)
+    return crc & 0xFFFFFFFF
+
+
+def compile_pack(json_path="levels.json", pack_path="levels.bin"):
+    """Compile levels.json into a level pack file"""
+    # Open the output first: on a read-only filesystem this fails before any JSON is parsed
+    with open(pack_path, 'wb') as out:
+        _write_pack(out, json_path)
+
+
+def _write_pack(out, json_path):
+    with open(json_path, 'r') as f:
+        data = json.load(f)
+    levels = data['levels']
+    settings = data['game_settings']
+
+    records = []
+    for level in levels:
+        name = level.get('name', '').encode('utf-8')
+        obstacles = level.get('obstacles', [])
+        parts = [struct.pack('<BB', level['level'], len(name)), name,
+                 struct.pack(LEVEL_HEAD, level.get('jump_height', -1),
+                             level.get('jump_duration', -1), len(obstacles))]
+        for obs in obstacles:
+            speed = obs.get('speed', 1.5)
+            parts.append(struct.pack(OBSTACLE, int(obs['x']), obs.get('y_offset', 0),
+                                     1 if obs.get('jumping', False) else 0, to_fixed(speed),
+                                     to_fixed(speed * SPEED_MULTIPLIERS["medium"]),
+                                     to_fixed(speed * SPEED_MULTIPLIERS["hard"])))
+        records.append(b''.join(parts))
+
+    max_obstacles = max(len(level.get('obstacles', [])) for level in levels)
+    header = struct.pack(HEADER, MAGIC, json_crc(json_path), len(levels), max_obstacles,
+                         settings.get('jump_height', 28), settings.get('jump_duration', 40),
+                         settings.get('ground_y', 50), settings.get('player_x', 10))
+
+    offset = struct.calcsize(HEADER) + struct.calcsize(INDEX) * len(records)
+    index = []
+    for record in records:
+        index.append(struct.pack(INDEX, offset, len(record)))
+        offset += len(record)
+
+    out.write(header)
+    for entry in index:
+        out.write(entry)
+    for record in records:
+        out.write(record)
+
+
+class LevelPack:
+    """
+    Read-only, list-like view of a level pack for one difficulty
+    Provides:
+        - len(pack), pack[i] → level dict in the same shape as levels.json
+        - settings → game_settings dict
+        - max_obstacles → busiest level's obstacle count
+    Only the most recently read level is kept in RAM.
+    """
+
+    def __init__(self, difficulty="easy", pack_path="levels.bin"):
+        self.pack_path = pack_path
+        self.speed_index = DIFFICULTIES.index(difficulty) if difficulty in DIFFICULTIES else 0
+
+        with open(pack_path, 'rb') as f:
+            head = f.read(struct.calcsize(HEADER))
+            magic, self.json_crc, count, self.max_obstacles, jump_height, jump_duration, \
+                ground_y, player_x = struct.unpack(HEADER, head)
+            if magic != MAGIC:
+                raise ValueError("not a level pack")
+            self._index = f.read(struct.calcsize(INDEX) * count)
+
+        self._count = count
+        self.settings = {
+            "jump_height": jump_height,
+            "jump_duration": jump_duration,
+            "ground_y": ground_y,
+            "player_x": player_x,
+        }
+        self._cached_index = None
+        self._cached_level = None
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("level index out of range")
+        if i != self._cached_index:
+            self._cached_level = self._read_level(i)
+            self._cached_index = i
+        return self._cached_level
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self[i]
+
+    def _read_level(self, i):
+        offset, length = struct.unpack_from(INDEX, self._index, i * struct.calcsize(INDEX))
+        with open(self.pack_path, 'rb') as f:
+            f.seek(offset)
+            record = f.read(length)
+
+        number, name_len = struct.unpack_from('<BB', record, 0)
+        pos = 2
+        name = record[pos:pos + name_len].decode('utf-8')
+        pos += name_len
+        jump_height, jump_duration, count = struct.unpack_from(LEVEL_HEAD, record, pos)
+        pos += struct.calcsize(LEVEL_HEAD)
+
+        level = {"level": number, "name": name, "obstacles": []}
+        if jump_height >= 0:
+            level["jump_height"] = jump_height
+        if jump_duration >= 0:
+            level["jump_duration"] = jump_duration
+
+        size = struct.calcsize(OBSTACLE)
+        for _ in range(count):
+            values = struct.unpack_from(OBSTACLE, record, pos)
+            pos += size
+            level["obstacles"].append({
+                "x": values[0],
+                "speed": values[3 + self.speed_index] / FIX_ONE,  # exact: a power-of-two fraction
+                "jumping": bool(values[2] & 1),
+                "y_offset": values[1],
+            })
+        return level
+
+
+def load_level_pack(difficulty="easy", json_path="levels.json", pack_path="levels.bin"):
+    """
+    Return (levels, game_settings) backed by the level pack
+
+    A pack whose stored CRC matches levels.json is used as is - levels.json is
+    only hashed, never parsed. Otherwise the pack is recompiled; if it cannot be
+    written (CIRCUITPY is read-only to code.py by default) this falls back to
+    load_levels() so the game still starts, parsing levels.json once.
+    """
+    try:
+        try:
+            with open(pack_path, 'rb') as f:
+                magic, pack_crc = struct.unpack_from('<4sI', f.read(8))
+            stale = magic != MAGIC or pack_crc != json_crc(json_path)
+        except Exception:
+            stale = True  # missing or truncated pack
+
+        if stale:
+            print("Compiling level pack...")
+            compile_pack(json_path, pack_path)
+
+        pack = LevelPack(difficulty, pack_path)
+        return pack, pack.settings
+    except (OSError, ValueError) as e:
+        print(f"Level pack unavailable ({e}), loading levels.json")
+        return load_levels(difficulty, json_path)
+
+
+# Host build: python3 level_pack.py [levels.json] [levels.bin]
+if __name__ == "__main__":
+    import sys
+
+    args = sys.argv[1:]
+    json_path = args[0] if args else "levels.json"
+    pack_path = args[1] if len(args) > 1 else "levels.bin"
+    compile_pack(json_path, pack_path)
+    print(f"Wrote {pack_path} ({os.stat(pack_path)[6]} bytes)")
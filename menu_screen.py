@@ -1,15 +1,19 @@
 import displayio
 import terminalio
 from adafruit_display_text import label
-import time
+import sprites
+
+# Option rows: four options fit under the title on the 64 px screen
+OPTION_TOP = 24
+OPTION_STEP = 10
 
 class MenuScreen:
-    def __init__(self, display, encoder, button):
+    def __init__(self, display, inputs, refresher=None):
         self.display = display
-        self.encoder = encoder
-        self.button = button
+        self.inputs = inputs  # InputManager: encoder steps + "menu" button events
+        self.refresher = refresher  # RefreshController when auto_refresh is off
 
-        self.options = ["Easy", "Medium", "Hard"]
+        self.options = ["Easy", "Medium", "Hard", "Endless"]
         self.index = 0
 
         # UI 显示组
@@ -19,31 +23,37 @@ class MenuScreen:
         self.title = label.Label(terminalio.FONT, text="Select Difficulty", x=5, y=10)
         self.group.append(self.title)
 
-        # Arrow
-        self.arrow = label.Label(terminalio.FONT, text=">", x=5, y=30)
-        self.group.append(self.arrow)
+        # Arrow - the shared star sprite, centred on the selected row
+        self.arrow = sprites.get_tiles("star", 1, "menu")[0]
+        self.arrow.x = 5
+        self.arrow.y = OPTION_TOP - 5
+        sprites.attach(self.group, self.arrow)
 
         # Menu Options
         self.labels = []
         for i, txt in enumerate(self.options):
-            lab = label.Label(terminalio.FONT, text=txt, x=20, y=30 + i * 12)
+            lab = label.Label(terminalio.FONT, text=txt, x=20, y=OPTION_TOP + i * OPTION_STEP)
             self.labels.append(lab)
             self.group.append(lab)
 
     def draw(self):
-        self.display.root_group = self.group
+        if self.refresher:
+            self.refresher.show(self.group)
+        else:
+            self.display.root_group = self.group
 
     def update(self):
-        self.encoder.update()
-        step = self.encoder.get_step()  # -1,0,+1
+        """Apply queued encoder steps; returns the option once the menu button is pressed"""
+        step = self.inputs.steps()  # net steps since the last update
 
         if step != 0:
             self.index += step
             self.index = max(0, min(len(self.options)-1, self.index))
-            self.arrow.y = 30 + self.index * 12
+            self.arrow.y = OPTION_TOP + self.index * OPTION_STEP - 5
+            if self.refresher:
+                self.refresher.mark_dirty()
 
-        if not self.button.value:  # pressed
-            time.sleep(0.2)
+        if self.inputs.pressed("menu"):
             return self.options[self.index]
 
         return None
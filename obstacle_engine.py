@@ -0,0 +1,259 @@
+# obstacle_engine.py
+# Struct-of-arrays obstacle storage with batched movement, jump arcs, wrap-around and collision.
+# Uses ulab.numpy on the device / NumPy on a host when present, plain array.array loops otherwise.
+# Positions and speeds are fixed point (1/256 px), so the board, a host and both paths
+# simulate bit for bit - float sub-pixel sums round differently in single and double precision.
+from array import array
+from jump_table import get_jump_table
+from collision import box_mask, overlap
+
+try:
+    from ulab import numpy as np  # CircuitPython builds with ulab
+except ImportError:
+    try:
+        import numpy as np  # host
+    except ImportError:
+        np = None
+
+# Fixed point: 8 fractional bits. Values stay far below 2**24, so the batch path's float
+# arrays hold them exactly too.
+FIX_SHIFT = 8
+FIX_ONE = 1 << FIX_SHIFT
+
+
+def to_fixed(value):
+    """Pixels (int or float) → nearest 1/256 px"""
+    return int(value * FIX_ONE + 0.5) if value >= 0 else -int(-value * FIX_ONE + 0.5)
+
+
+class ObstacleEngine:
+    """
+    Parallel arrays for every obstacle slot; only the first `count` are active
+    Provides:
+        - load(obstacle_data) → reset slots from a level's obstacle list
+        - step() → move/jump/wrap all active obstacles, returns number cleared
+        - hits(mask, x, y) → pixel-exact test against the obstacles in that mask's columns
+        - order → active slot indices sorted by x (kept up to date by load() / step())
+        - x → whole-pixel positions (floor of x_fp); x_fp / speed → 1/256 px fixed point
+    The array.array loop path allocates nothing per frame; the ulab batch path builds
+    temporary arrays, which only pays off for large pools (capacity >= batch_min).
+    """
+
+    def __init__(self, capacity, ground_y, width=12, height=8, screen_width=128,
+                 respawn_gap=70, jump_window=(60, 90), jump_duration=20, jump_height=15,
+                 batch_min=8, mask=None):
+        """
+        Args:
+            capacity: Number of obstacle slots (busiest level)
+            ground_y: Resting y of a ground-level obstacle
+            width, height: Sprite size in pixels
+            screen_width: Respawn base x (default: 128)
+            respawn_gap: Extra x per active obstacle when respawning (default: 70)
+            jump_window: (min_x, max_x) where jumping obstacles take off
+            jump_duration: Obstacle jump length in ticks (default: 20)
+            jump_height: Obstacle jump apex in pixels (default: 15)
+            batch_min: Slots needed before the ulab/NumPy batch path is used; below it
+                       the per-call array overhead costs more than the loop (default: 8)
+            mask: collision.Mask of the obstacle sprite (default: solid width x height box)
+        """
+        self.capacity = capacity
+        self.count = 0
+        self.ground_y = ground_y
+        self.width = width
+        self.height = height
+        self.screen_width = screen_width
+        self.respawn_gap = respawn_gap
+        self.jump_min_x, self.jump_max_x = jump_window
+        self.jump_duration = jump_duration
+        self.jump_height = jump_height
+        self.jump_table = get_jump_table(jump_height, jump_duration)
+        self.mask = mask if mask is not None else box_mask(width, height)
+        self.order = array('B', range(capacity))
+
+        self.np = np if (np is not None and batch_min is not None and capacity >= batch_min) else None
+        if self.np is not None:
+            zeros = self.np.zeros
+            self.x = zeros(capacity) + 500
+            self.x_fp = zeros(capacity) + (500 << FIX_SHIFT)  # integer values
+            self.y = zeros(capacity) + ground_y
+            self.base_y = zeros(capacity) + ground_y
+            self.speed = zeros(capacity)
+            self.timer = zeros(capacity, dtype=self.np.int16)  # ticks left in the jump (0 = grounded)
+            self.can_jump = zeros(capacity)   # 1.0 / 0.0 flags
+            self._lift = self.np.array(self.jump_table, dtype=self.np.int16)
+        else:
+            self.x = array('h', [500] * capacity)
+            self.x_fp = array('l', [500 << FIX_SHIFT] * capacity)
+            self.y = array('h', [ground_y] * capacity)
+            self.base_y = array('h', [ground_y] * capacity)
+            self.speed = array('l', [0] * capacity)
+            self.timer = array('h', [0] * capacity)
+            self.can_jump = array('b', [0] * capacity)
+
+    def load(self, obstacle_data):
+        """Reset slots from a level's 'obstacles' list; unused slots park off-screen"""
+        self.count = len(obstacle_data)
+        for i in range(self.capacity):
+            if i < self.count:
+                obs_data = obstacle_data[i]
+                x_fp = to_fixed(obs_data['x'])
+                self.x_fp[i] = x_fp
+                self.x[i] = x_fp >> FIX_SHIFT
+                self.speed[i] = to_fixed(obs_data.get('speed', 1.5))
+                self.can_jump[i] = 1 if obs_data.get('jumping', False) else 0
+                self.base_y[i] = self.ground_y + obs_data.get('y_offset', 0)
+            else:
+                self.x_fp[i] = 500 << FIX_SHIFT
+                self.x[i] = 500
+                self.speed[i] = 0
+                self.can_jump[i] = 0
+                self.base_y[i] = self.ground_y
+            self.timer[i] = 0
+            self.y[i] = self.base_y[i]
+            self.order[i] = i
+        self._sort()
+
+    def step(self):
+        """Advance every active obstacle one tick. Returns how many wrapped (cleared)"""
+        if self.np is not None:
+            cleared = self._step_batch()
+            self._sort()
+        else:
+            cleared = self._step_loop()  # re-sorts only if something overtook
+        return cleared
+
+    def _sort(self):
+        """Insertion sort of order by x - one pass when nothing overtook anything"""
+        n = self.count
+        if n < 2:
+            return
+        order = self.order
+        xs = self.x_fp
+        largest = xs[order[0]]
+        for k in range(1, n):
+            i = order[k]
+            x = xs[i]
+            if x >= largest:
+                largest = x  # already in place - the common case
+                continue
+            j = k - 1
+            while j >= 0 and xs[order[j]] > x:
+                order[j + 1] = order[j]
+                j -= 1
+            order[j + 1] = i
+
+    def _step_batch(self):
+        np = self.np
+        n = self.count
+        x = self.x_fp[:n]
+        timer = self.timer[:n]
+        base_y = self.base_y[:n]
+
+        # Movement (whole 1/256 px steps - exact in float storage)
+        x -= self.speed[:n]
+
+        # Obstacle Jumping (Hard Mode) - take off inside the window, then follow the arc
+        takeoff = (self.can_jump[:n] > 0) * (timer <= 0) * \
+            (x > self.jump_min_x << FIX_SHIFT) * (x < self.jump_max_x << FIX_SHIFT)
+        timer = np.where(takeoff, self.jump_duration, timer)
+        airborne = timer > 0
+        y = np.where(airborne, base_y - np.take(self._lift, timer), self.y[:n])
+        timer = np.where(airborne, timer - 1, timer)
+        y = np.where(airborne * (timer <= 0), base_y, y)
+
+        # Wrap-around
+        cleared_mask = x < -self.width << FIX_SHIFT
+        cleared = int(np.sum(cleared_mask))
+        if cleared:
+            x[:] = np.where(cleared_mask, (self.screen_width + n * self.respawn_gap) << FIX_SHIFT, x)
+            timer = np.where(cleared_mask, 0, timer)
+            y = np.where(cleared_mask, base_y, y)
+
+        self.x[:n] = np.floor(x * (1 / FIX_ONE))  # x is a view: x_fp is already updated
+        self.timer[:n] = timer
+        self.y[:n] = y
+        return cleared
+
+    def _step_loop(self):
+        n = self.count
+        xs = self.x_fp
+        pixels = self.x
+        ys = self.y
+        timers = self.timer
+        duration = self.jump_duration
+        lift = self.jump_table
+        order = self.order
+        jump_min = self.jump_min_x << FIX_SHIFT
+        jump_max = self.jump_max_x << FIX_SHIFT
+        wrap_x = -self.width << FIX_SHIFT
+        cleared = 0
+        last_x = None
+        unsorted = False
+
+        # Walk slots in x order so overtakes show up as a descent
+        for k in range(n):
+            i = order[k]
+            x = xs[i] - self.speed[i]
+
+            # Obstacle Jumping (Hard Mode)
+            if self.can_jump[i]:
+                if timers[i] <= 0 and jump_min < x < jump_max:
+                    timers[i] = duration
+
+                if timers[i] > 0:
+                    ys[i] = self.base_y[i] - lift[timers[i]]
+
+                    timers[i] -= 1
+                    if timers[i] <= 0:
+                        ys[i] = self.base_y[i]
+
+            # Wrap-around
+            if x < wrap_x:
+                cleared += 1
+                x = (self.screen_width + n * self.respawn_gap) << FIX_SHIFT
+                timers[i] = 0
+                ys[i] = self.base_y[i]
+            xs[i] = x
+            pixels[i] = x >> FIX_SHIFT
+
+            if last_x is not None and x < last_x:
+                unsorted = True
+            last_x = x
+
+        if unsorted:
+            self._sort()
+        return cleared
+
+    def hits(self, mask, x, y):
+        """
+        True if mask at (x, y) touches an opaque pixel of any active obstacle
+
+        Broad phase: binary search order for the first obstacle whose right
+        edge is past x, then walk right until obstacles start beyond the mask.
+        Only those reach the per-row narrow phase.
+        """
+        order = self.order
+        xs = self.x
+        ys = self.y
+        width = self.width
+        obstacle_mask = self.mask
+
+        # First obstacle with int(x) + width > x
+        lo = 0
+        hi = self.count
+        while lo < hi:
+            mid = (lo + hi) >> 1
+            if int(xs[order[mid]]) + width > x:
+                hi = mid
+            else:
+                lo = mid + 1
+
+        right = x + mask.width
+        for k in range(lo, self.count):
+            i = order[k]
+            obs_x = int(xs[i])
+            if obs_x >= right:
+                break
+            if overlap(mask, x, y, obstacle_mask, obs_x, int(ys[i])):
+                return True
+        return False
@@ -0,0 +1,147 @@
+# pickup_detector.py
+# Streaming pickup detection: an EMA low-pass tracks gravity (and slow tilt), the rest is motion.
+# Motion energy (squared magnitude - no sqrt) is summed over a small ring buffer and compared
+# against on / off thresholds with hysteresis, so a device resting at 9.8 m/s^2 never counts.
+import math
+from array import array
+
+
+class PickupDetector:
+    """
+    Pickup / handling detector for a stream of accelerometer samples
+    Provides:
+        - feed(x, y, z) → True while the device is being handled
+        - feed_many(samples) → True if handled at any point in a batch of (x, y, z)
+        - picked_up → current state
+        - pickups → off → on transitions so far
+        - reset() → forget gravity and motion history
+    """
+
+    def __init__(self, sample_hz=20, cutoff_hz=0.5, window_ms=200, on_rms=1.0, off_rms=0.4):
+        """
+        Args:
+            sample_hz: Rate samples arrive at - sets the filter constant and window length
+            cutoff_hz: High-pass corner; slower changes (gravity, a new resting tilt) are ignored
+            window_ms: Motion energy window (default: 200)
+            on_rms: RMS motion in m/s^2 that starts a pickup (default: 1.0)
+            off_rms: RMS motion in m/s^2 below which it ends (default: 0.4)
+        """
+        self.sample_hz = sample_hz
+        self.alpha = 1 - math.exp(-2 * math.pi * cutoff_hz / sample_hz)
+        size = max(1, int(window_ms * sample_hz / 1000 + 0.5))
+        self._ring = array('f', [0.0] * size)
+
+        # Compare the window's energy sum with squared thresholds scaled to the window
+        self._on = on_rms * on_rms * size
+        self._off = off_rms * off_rms * size
+        self.pickups = 0
+        self.reset()
+
+    def reset(self):
+        ring = self._ring
+        for i in range(len(ring)):
+            ring[i] = 0.0
+        self._index = 0
+        self._sum = 0.0
+        self._primed = False
+        self._gx = 0.0
+        self._gy = 0.0
+        self._gz = 0.0
+        self.picked_up = False
+
+    def feed(self, x, y, z):
+        """Add one sample (m/s^2). Returns the pickup state after it"""
+        if not self._primed:
+            # Start from the first reading so power-up isn't one big step
+            self._gx = x
+            self._gy = y
+            self._gz = z
+            self._primed = True
+
+        # Gravity estimate (EMA low-pass); what is left over is motion
+        a = self.alpha
+        gx = self._gx + a * (x - self._gx)
+        gy = self._gy + a * (y - self._gy)
+        gz = self._gz + a * (z - self._gz)
+        self._gx = gx
+        self._gy = gy
+        self._gz = gz
+        dx = x - gx
+        dy = y - gy
+        dz = z - gz
+        energy = dx * dx + dy * dy + dz * dz
+
+        # Ring buffer with a running sum
+        ring = self._ring
+        i = self._index
+        total = self._sum + energy - ring[i]
+        ring[i] = energy
+        i += 1
+        if i == len(ring):
+            i = 0
+            # Once per lap, re-add from scratch so float rounding can't accumulate
+            total = 0.0
+            for e in ring:
+                total += e
+        self._index = i
+        self._sum = total
+
+        # Hysteresis
+        if self.picked_up:
+            if total < self._off:
+                self.picked_up = False
+        elif total > self._on:
+            self.picked_up = True
+            self.pickups += 1
+        return self.picked_up
+
+    def feed_many(self, samples):
+        """Add a batch of (x, y, z) samples (e.g. a FIFO drain). True if any left it picked up"""
+        # feed() with the state held in locals for the whole batch
+        if not samples:
+            return self.picked_up
+        if not self._primed:
+            self.feed(*samples[0])
+            return self.feed_many(samples[1:]) or self.picked_up
+        a = self.alpha
+        gx = self._gx
+        gy = self._gy
+        gz = self._gz
+        ring = self._ring
+        size = len(ring)
+        i = self._index
+        total = self._sum
+        on = self._on
+        off = self._off
+        picked_up = self.picked_up
+        seen = picked_up
+        for x, y, z in samples:
+            gx += a * (x - gx)
+            gy += a * (y - gy)
+            gz += a * (z - gz)
+            dx = x - gx
+            dy = y - gy
+            dz = z - gz
+            energy = dx * dx + dy * dy + dz * dz
+            total += energy - ring[i]
+            ring[i] = energy
+            i += 1
+            if i == size:
+                i = 0
+                total = 0.0
+                for e in ring:
+                    total += e
+            if picked_up:
+                if total < off:
+                    picked_up = False
+            elif total > on:
+                picked_up = True
+                seen = True
+                self.pickups += 1
+        self._gx = gx
+        self._gy = gy
+        self._gz = gz
+        self._index = i
+        self._sum = total
+        self.picked_up = picked_up
+        return seen
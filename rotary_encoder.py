@@ -1,6 +1,27 @@
 # rotary_encoder.py
-import time
+# Steps are queued in a preallocated ring (time / direction arrays) with ticks.py timestamps,
+# so turning the knob mid-game allocates nothing.
+from array import array
 import digitalio
+from ticks import ticks_ms, ticks_diff
+
+try:
+    import rotaryio  # counts edges in hardware / interrupts
+except ImportError:
+    rotaryio = None
+
+# Quadrature decode table, indexed by (prev_state << 2) | new_state with state = (A << 1) | B
+#   +1 clockwise:          11→10, 10→00, 00→01, 01→11
+#   -1 counter-clockwise:  11→01, 01→00, 00→10, 10→11
+#    0 no change or an invalid (skipped) transition
+TRANSITIONS = array('b', [
+    # new: 00  01  10  11
+    0, +1, -1,  0,   # prev 00
+    -1, 0,  0, +1,   # prev 01
+    +1, 0,  0, -1,   # prev 10
+    0, -1, +1,  0,   # prev 11
+])
+
 
 class RotaryEncoder:
     """
@@ -8,9 +29,39 @@ class RotaryEncoder:
     Provides:
         - update()
         - get_step() → returns -1 / +1 when rotated
+        - events() → timestamped steps as (ticks_ms, ±1), oldest first
+    Uses rotaryio (edges captured in the background) when available,
+    otherwise decodes polled pin states through a 16-entry lookup table.
     """
 
-    def __init__(self, pin_a, pin_b, *, pull=digitalio.Pull.UP, debounce_ms=3):
+    def __init__(self, pin_a, pin_b, *, pull=digitalio.Pull.UP, debounce_ms=3,
+                 backend="auto", queue_size=32):
+        """
+        Args:
+            pin_a, pin_b: Encoder A / B pins
+            pull: Pull direction for the polled backend (default: UP)
+            debounce_ms: Minimum time between polled transitions (default: 3)
+            backend: "auto", "rotaryio" or "poll" (default: "auto")
+            queue_size: Steps kept in the event queue before the oldest drop (default: 32)
+        """
+        # event ring: oldest step at _head, _count steps queued
+        self._queue_size = queue_size
+        self._time_q = array('l', [0] * queue_size)     # ticks_ms
+        self._step_q = array('b', [0] * queue_size)     # +1 / -1
+        self._head = 0
+        self._count = 0
+        self.dropped = 0
+
+        if backend == "auto":
+            backend = "rotaryio" if rotaryio is not None else "poll"
+        self.backend = backend
+
+        if backend == "rotaryio":
+            # divisor=1: one step per quadrature transition, same as the polled decoder
+            self._hw = rotaryio.IncrementalEncoder(pin_a, pin_b, divisor=1)
+            self._last_position = self._hw.position
+            return
+
         # A & B pins
         self._a = digitalio.DigitalInOut(pin_a)
         self._a.switch_to_input(pull=pull)
@@ -20,56 +71,66 @@ class RotaryEncoder:
 
         # timing
         self._debounce_ms = debounce_ms
-        self._last_time = time.monotonic() * 1000
+        self._last_time = ticks_ms()
+
+        # state - packed 2-bit (A << 1) | B
+        self._last_state = (self._a.value << 1) | self._b.value
 
-        # state
-        self._last_state = (self._a.value, self._b.value)
-        self._step = 0  # menu movement accumulator
+    def _push(self, now, direction, count=1):
+        size = self._queue_size
+        for _ in range(count):
+            if self._count >= size:
+                self._head = (self._head + 1) % size  # drop the oldest
+                self._count -= 1
+                self.dropped += 1
+            tail = (self._head + self._count) % size
+            self._time_q[tail] = now
+            self._step_q[tail] = direction
+            self._count += 1
 
     def update(self):
-        """Call frequently. Detect and accumulate steps."""
-        now = time.monotonic() * 1000
-        raw = (self._a.value, self._b.value)
+        """Call frequently. Detect and queue steps."""
+        if self.backend == "rotaryio":
+            position = self._hw.position
+            delta = position - self._last_position
+            if delta:
+                self._last_position = position
+                self._push(ticks_ms(), 1 if delta > 0 else -1, abs(delta))
+            return
+
+        state = (self._a.value << 1) | self._b.value
 
         # no change
-        if raw == self._last_state:
+        if state == self._last_state:
             return
 
         # debounce
-        if now - self._last_time < self._debounce_ms:
+        now = ticks_ms()
+        if ticks_diff(now, self._last_time) < self._debounce_ms:
             return
 
         self._last_time = now
 
-        prev = self._last_state
-        self._last_state = raw
-
-        # Decode quadrature
-        a_prev, b_prev = prev
-        a_now, b_now = raw
-
-        # CLOCKWISE
-        if a_prev == 1 and b_prev == 1 and a_now == 1 and b_now == 0:
-            self._step += 1
-        elif a_prev == 1 and b_prev == 0 and a_now == 0 and b_now == 0:
-            self._step += 1
-        elif a_prev == 0 and b_prev == 0 and a_now == 0 and b_now == 1:
-            self._step += 1
-        elif a_prev == 0 and b_prev == 1 and a_now == 1 and b_now == 1:
-            self._step += 1
-
-        # COUNTER CLOCKWISE
-        elif a_prev == 1 and b_prev == 1 and a_now == 0 and b_now == 1:
-            self._step -= 1
-        elif a_prev == 0 and b_prev == 1 and a_now == 0 and b_now == 0:
-            self._step -= 1
-        elif a_prev == 0 and b_prev == 0 and a_now == 1 and b_now == 0:
-            self._step -= 1
-        elif a_prev == 1 and b_prev == 0 and a_now == 1 and b_now == 1:
-            self._step -= 1
+        step = TRANSITIONS[(self._last_state << 2) | state]
+        self._last_state = state
+        if step:
+            self._push(now, step)
+
+    def events(self):
+        """Pop and return all queued (ticks_ms, direction) steps"""
+        size = self._queue_size
+        out = [(self._time_q[(self._head + i) % size], self._step_q[(self._head + i) % size])
+               for i in range(self._count)]
+        self._head = 0
+        self._count = 0
+        return out
 
     def get_step(self):
         """Returns accumulated step: -1, +1, or 0."""
-        step = self._step
-        self._step = 0
+        step = 0
+        size = self._queue_size
+        for i in range(self._count):
+            step += self._step_q[(self._head + i) % size]
+        self._head = 0
+        self._count = 0
         return step
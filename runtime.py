@@ -0,0 +1,92 @@
+# runtime.py
+# Cooperative asyncio runtime: sensor, input and render tasks each run at their own rate
+# next to one screen-logic task; everything yields, so the CPU idles between deadlines.
+import asyncio
+from frame_profiler import INPUT, SENSOR, REFRESH, IDLE
+
+
+class Runtime:
+    """
+    Background tasks shared by every screen
+    Provides:
+        - run(logic) → run a screen-logic coroutine with the background tasks (blocking)
+        - start() / stop() → manage the background tasks from inside a running loop
+        - accel_monitor → may be set later (sensor task skips it while None)
+        - profiler → FrameProfiler the tasks charge their time to (None = off)
+    """
+
+    def __init__(self, inputs, refresher, accel_monitor=None, input_hz=200, sensor_hz=20,
+                 profiler=None):
+        """
+        Args:
+            inputs: InputManager polled by the input task
+            refresher: RefreshController driven by the render task (rate = its target_fps)
+            accel_monitor: AccelMonitor updated by the sensor task (optional)
+            input_hz: Button / encoder poll rate (default: 200)
+            sensor_hz: AccelMonitor update rate (default: 20)
+            profiler: FrameProfiler for per-phase timing (optional)
+        """
+        self.inputs = inputs
+        self.refresher = refresher
+        self.accel_monitor = accel_monitor
+        self.input_period = 1 / input_hz
+        self.sensor_period = 1 / sensor_hz
+        self.profiler = profiler
+        self._tasks = []
+
+    # Each task charges its wake-up wait to IDLE and its own work to its phase
+    async def input_task(self):
+        while True:
+            profiler = self.profiler
+            if profiler is not None:
+                profiler.lap(IDLE)
+            self.inputs.poll()
+            if profiler is not None:
+                profiler.lap(INPUT)
+            await asyncio.sleep(self.input_period)
+
+    async def sensor_task(self):
+        while True:
+            profiler = self.profiler
+            if self.accel_monitor is not None:
+                if profiler is not None:
+                    profiler.lap(IDLE)
+                self.accel_monitor.update()
+                if profiler is not None:
+                    profiler.lap(SENSOR)
+            await asyncio.sleep(self.sensor_period)
+
+    async def render_task(self):
+        while True:
+            profiler = self.profiler
+            if profiler is not None:
+                profiler.lap(IDLE)
+            self.refresher.refresh()
+            if profiler is not None:
+                profiler.lap(REFRESH)
+            await asyncio.sleep(1 / self.refresher.target_fps)
+
+    def start(self):
+        """Start the background tasks (call from inside the event loop)"""
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self.input_task()),
+                asyncio.create_task(self.sensor_task()),
+                asyncio.create_task(self.render_task()),
+            ]
+
+    def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    async def _main(self, logic):
+        self.start()
+        try:
+            return await logic
+        finally:
+            self.stop()
+
+    def run(self, logic):
+        """Run the logic coroutine to completion alongside the background tasks"""
+        return asyncio.run(self._main(logic))
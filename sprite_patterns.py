@@ -0,0 +1,40 @@
+# sprite_patterns.py
+# Bit-packed sprite patterns - plain data, no displayio, so simulation and host tools can use them.
+
+# Patterns: (width, height, rows) - each row is 2 bytes, MSB = leftmost pixel
+PATTERNS = {
+    # Player Star 11x11
+    "star": (11, 11, bytes((
+        0x04, 0x00,   # .....#.....
+        0x0E, 0x00,   # ....###....
+        0x0E, 0x00,   # ....###....
+        0x15, 0x00,   # ...#.#.#...
+        0x64, 0xC0,   # .##..#..##.
+        0xFF, 0xE0,   # ###########
+        0x7F, 0xC0,   # .#########.
+        0x3B, 0x80,   # ..###.###..
+        0x31, 0x80,   # ..##...##..
+        0x60, 0xC0,   # .##.....##.
+        0x40, 0x40,   # .#.......#.
+    ))),
+    # Obstacle Spaceship 12x8
+    "spaceship": (12, 8, bytes((
+        0x0E, 0x00,   # ....###.....
+        0x1F, 0x00,   # ...#####....
+        0x3F, 0x80,   # ..#######...
+        0x7F, 0xE0,   # .##########.
+        0xFF, 0xF0,   # ############
+        0x7F, 0xE0,   # .##########.
+        0x3F, 0x80,   # ..#######...
+        0x1C, 0xC0,   # ...###..##..
+    ))),
+}
+
+ROW_BYTES = 2
+
+
+def row_bits(name, y):
+    """Pattern row y as an integer, bit (width - 1 - x) set for pixel x"""
+    width, _, rows = PATTERNS[name]
+    value = (rows[y * ROW_BYTES] << 8) | rows[y * ROW_BYTES + 1]
+    return value >> (ROW_BYTES * 8 - width)
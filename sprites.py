@@ -0,0 +1,80 @@
+# sprites.py
+# Shared sprite cache: bit-packed patterns decoded into displayio Bitmaps once per boot.
+import displayio
+from sprite_patterns import PATTERNS, ROW_BYTES, row_bits  # re-exported for existing callers
+
+_palette = None
+_bitmaps = {}
+_tiles = {}
+_parents = {}   # id(tile) -> Group it currently sits in
+
+
+def get_palette():
+    """Shared black / white palette"""
+    global _palette
+    if _palette is None:
+        _palette = displayio.Palette(2)
+        _palette[0] = 0x000000
+        _palette[1] = 0xFFFFFF
+    return _palette
+
+
+def get_bitmap(name):
+    """Decoded Bitmap for a pattern (built on first use, then cached)"""
+    bitmap = _bitmaps.get(name)
+    if bitmap is None:
+        width, height, _ = PATTERNS[name]
+        bitmap = displayio.Bitmap(width, height, 2)
+        for y in range(height):
+            bits = row_bits(name, y)
+            for x in range(width):
+                if bits & (1 << (width - 1 - x)):
+                    bitmap[x, y] = 1
+        _bitmaps[name] = bitmap
+    return bitmap
+
+
+def get_tiles(name, count, owner):
+    """
+    Cached TileGrids for a sprite, reused across calls with the same owner key
+
+    A TileGrid can only sit in one Group at a time; add them with attach()
+    so they are moved out of the previous screen's group first.
+    """
+    key = (owner, name)
+    tiles = _tiles.get(key)
+    if tiles is None:
+        tiles = []
+        _tiles[key] = tiles
+    while len(tiles) < count:
+        tiles.append(displayio.TileGrid(get_bitmap(name), pixel_shader=get_palette()))
+    return tiles[:count]
+
+
+def attach(group, tile):
+    """Append a cached tile to group, detaching it from the group it was last in"""
+    previous = _parents.get(id(tile))
+    if previous is group:
+        return
+    if previous is not None:
+        previous.remove(tile)
+    group.append(tile)
+    _parents[id(tile)] = group
+
+
+def footprint():
+    """Approximate RAM held by the cache, in bytes"""
+    packed = 0
+    decoded = 0
+    for name, (width, height, rows) in PATTERNS.items():
+        packed += len(rows)
+        if name in _bitmaps:
+            # 1 bit per pixel, rows padded to 32-bit words
+            decoded += ((width + 31) // 32) * 4 * height
+    tiles = sum(len(tiles) for tiles in _tiles.values())
+    return {
+        "packed_bytes": packed,
+        "bitmap_bytes": decoded,
+        "bitmaps": len(_bitmaps),
+        "tile_grids": tiles,
+    }
@@ -0,0 +1,86 @@
+# text_cache.py
+# Pre-rendered text: each fixed string is laid out once into its own bitmap_label
+# (one Bitmap + TileGrid); showing a string afterwards only flips `hidden` flags.
+import displayio
+import terminalio
+from adafruit_display_text import bitmap_label
+
+
+class TextCache:
+    """
+    One on-screen text slot backed by pre-rendered strings
+    Provides:
+        - add(key, text, x, y) → render once (later calls with the same key are free)
+        - show(key) → swap to that string (renders it first if it was never added)
+        - hide() → show nothing
+        - group → displayio.Group to append to the screen once
+    With a limit, the oldest hidden strings are dropped so an unbounded key set
+    (endless wave titles) keeps a fixed number of bitmaps.
+    """
+
+    def __init__(self, x=0, y=0, font=terminalio.FONT, color=0xFFFFFF, limit=None):
+        """
+        Args:
+            x, y: Default position for strings added without one
+            font: Font to render with (default: terminalio.FONT)
+            color: Text colour (default: white)
+            limit: Most strings kept rendered (default: no limit)
+        """
+        self.x = x
+        self.y = y
+        self.font = font
+        self.color = color
+        self.group = displayio.Group()
+        self.current = None
+        self.limit = limit
+        self._labels = {}
+        self._order = []    # keys, oldest first (dicts are unordered on older firmware)
+
+    def add(self, key, text=None, x=None, y=None):
+        """Render text (default: key) into a hidden bitmap label"""
+        if key in self._labels:
+            return self._labels[key]
+        if text is None:
+            text = key
+        if self.limit is not None and len(self._order) >= self.limit:
+            self._evict()
+        lab = bitmap_label.Label(self.font, text=text, color=self.color,
+                                 x=self.x if x is None else x,
+                                 y=self.y if y is None else y)
+        lab.hidden = True
+        self.group.append(lab)
+        self._labels[key] = lab
+        self._order.append(key)
+        return lab
+
+    def _evict(self):
+        """Drop the oldest string that is not on screen"""
+        for i in range(len(self._order)):
+            key = self._order[i]
+            if key != self.current:
+                self.group.remove(self._labels.pop(key))
+                self._order.pop(i)
+                return
+
+    def show(self, key):
+        """Make key's string the visible one. Returns True if anything changed"""
+        if key == self.current:
+            return False
+        lab = self._labels.get(key)
+        if lab is None:
+            lab = self.add(key)
+        self.hide()
+        lab.hidden = False
+        self.current = key
+        return True
+
+    def hide(self):
+        if self.current is not None:
+            self._labels[self.current].hidden = True
+            self.current = None
+
+    def __contains__(self, key):
+        return key in self._labels
+
+    def __len__(self):
+        return len(self._labels)
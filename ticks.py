@@ -0,0 +1,24 @@
+# ticks.py
+# Millisecond ticks that stay small ints (no heap use), unlike time.monotonic_ns().
+# adafruit_ticks ships with asyncio on the board; the fallback keeps host tools working.
+try:
+    from adafruit_ticks import ticks_ms, ticks_add, ticks_diff
+except ImportError:
+    import time
+
+    _TICKS_PERIOD = 1 << 29
+    _TICKS_MAX = _TICKS_PERIOD - 1
+    _TICKS_HALFPERIOD = _TICKS_PERIOD // 2
+
+    def ticks_ms():
+        """Milliseconds, wrapping at 2**29"""
+        return (time.monotonic_ns() // 1000000) & _TICKS_MAX
+
+    def ticks_add(ticks, delta):
+        """ticks + delta, wrapped"""
+        return (ticks + delta) % _TICKS_PERIOD
+
+    def ticks_diff(ticks1, ticks2):
+        """Signed ticks1 - ticks2, correct across one wrap"""
+        diff = (ticks1 - ticks2) & _TICKS_MAX
+        return ((diff + _TICKS_HALFPERIOD) & _TICKS_MAX) - _TICKS_HALFPERIOD
@@ -0,0 +1,62 @@
+# timeline.py
+# Timed step sequences (message screens, pauses) advanced by deadline checks instead of sleeps.
+from ticks import ticks_ms, ticks_add, ticks_diff
+
+
+class Timeline:
+    """
+    A sequence of timed steps, checked once per frame
+    Provides:
+        - start() → begin at the first step
+        - update() → the step tuple when a new step begins, otherwise None
+        - index → current step number
+        - elapsed_ms() → time since start()
+        - done → True once the last step has run out (never when looping)
+    """
+
+    def __init__(self, steps, loop=False):
+        """
+        Args:
+            steps: Tuple of steps; the last item of each is its duration in ms
+            loop: Restart from the first step after the last (default: False)
+        """
+        self.steps = steps
+        self.loop = loop
+        self.index = -1
+        self.done = False
+        self._started = 0
+        self._deadline = 0
+
+    def start(self):
+        """Arm the timeline; the first update() returns the first step"""
+        self.index = -1
+        self.done = False
+        self._started = ticks_ms()
+        self._deadline = self._started
+
+    def elapsed_ms(self):
+        return ticks_diff(ticks_ms(), self._started)
+
+    def update(self):
+        """Advance past any expired steps. Returns the newly started step, or None"""
+        if self.done:
+            return None
+        now = ticks_ms()
+        late = ticks_diff(now, self._deadline)
+        if late < 0:
+            return None
+
+        self.index += 1
+        if self.index >= len(self.steps):
+            if not self.loop:
+                self.done = True
+                return None
+            self.index = 0
+
+        step = self.steps[self.index]
+        # Schedule from the old deadline so late frames don't stretch the sequence
+        # (unless we are more than a whole step behind)
+        if late > step[-1]:
+            self._deadline = now
+        self._deadline = ticks_add(self._deadline, step[-1])
+        return step
@@ -0,0 +1,495 @@
+# bench.py
+# Host benchmark suite: times the hot paths against the CircuitPython stubs in tools/stubs.
+#
+#   python3 tools/bench.py --out bench.json
+#   python3 tools/bench.py --baseline bench.json --threshold 1.25 --limit level_session=1.1
+#   python3 tools/bench.py --alloc
+import argparse
+import contextlib
+import dis
+import gc
+import inspect
+import io
+import json
+import os
+import runpy
+import sys
+import time
+
+TOOLS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(TOOLS)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(TOOLS, "stubs"))  # board, displayio, neopixel, ... for the host
+
+LEVELS_JSON = os.path.join(ROOT, "levels.json")
+
+
+# Benchmarks - each setup returns the callable to time
+
+def setup_load_levels():
+    """levels.json parse + difficulty scaling"""
+    import game_core
+    return lambda: game_core.load_levels("easy", LEVELS_JSON)
+
+
+def setup_level_session():
+    """One level played start to finish by the lead bot (run_game's work minus its 30 ms pacing)"""
+    import game_core
+    from headless_runner import lead_policy, run_session
+    levels, settings = game_core.load_levels("easy", LEVELS_JSON)
+    return lambda: run_session(levels, settings, 0, lead_policy(20))
+
+
+def setup_obstacle_frame():
+    """Obstacle step + collision for one frame of the busiest hard level"""
+    import game_core
+    levels, settings = game_core.load_levels("hard", LEVELS_JSON)
+    busiest = max(range(len(levels)), key=lambda i: len(levels[i]['obstacles']))
+    state = game_core.GameState(levels, settings, busiest)
+    obstacles = state.obstacles
+    mask = state.player_mask
+    x = state.player_x
+    y = state.ground_y
+
+    def frame():
+        obstacles.step()
+        obstacles.hits(mask, x, y)
+    return frame
+
+
+def setup_wrap_text():
+    """code.py's intro text wrapper on a three-line string"""
+    # code.py only runs main() as __main__; its display setup runs on the stubs
+    app = runpy.run_path(os.path.join(ROOT, "code.py"), run_name="bench")
+    wrap_text = app["wrap_text"]
+    text = "Return to your world, life still goes on. It's year of 3035"
+    return lambda: wrap_text(text)
+
+
+def setup_rotary_update():
+    """Polled decoder, turning one quadrature step per call"""
+    import board
+    import digitalio
+    from rotary_encoder import RotaryEncoder
+    encoder = RotaryEncoder(board.D9, board.D8, backend="poll", debounce_ms=0)
+    pin_a = digitalio.PINS[board.D9]
+    pin_b = digitalio.PINS[board.D8]
+    sequence = ((True, False), (False, False), (False, True), (True, True))
+    position = [0]
+
+    def turn():
+        a, b = sequence[position[0] & 3]
+        position[0] += 1
+        pin_a.value = a
+        pin_b.value = b
+        encoder.update()
+        encoder.get_step()
+    return turn
+
+
+def setup_accel_update():
+    """Polling mode (adafruit_adxl34x read every call)"""
+    import busio
+    from accel_monitor import AccelMonitor
+    monitor = AccelMonitor(busio.I2C(), num_pixels=8)
+    return monitor.update
+
+
+def setup_accel_update_stream():
+    """Streaming mode with INT1 wired, device at rest (no bus traffic expected)"""
+    import busio
+    from accel_monitor import AccelMonitor
+    from adxl345_fake import FakeADXL345
+    chip = FakeADXL345()
+    monitor = AccelMonitor(busio.I2C(), num_pixels=8, streaming=True,
+                           int_pin=chip.int1, accel_device=chip)
+    return monitor.update
+
+
+# (name, setup, calls per timed run)
+BENCHMARKS = [
+    ("load_levels", setup_load_levels, 200),
+    ("level_session", setup_level_session, 20),
+    ("obstacle_frame", setup_obstacle_frame, 20000),
+    ("wrap_text", setup_wrap_text, 20000),
+    ("rotary_update", setup_rotary_update, 20000),
+    ("accel_update", setup_accel_update, 20000),
+    ("accel_update_stream", setup_accel_update_stream, 20000),
+]
+
+
+# Allocation check - a CircuitPython heap model over CPython.
+# CPython boxes every int / float, so a per-frame tracemalloc or gc figure can't say what
+# the board allocates. Instead, every bytecode that runs in a project module is traced and flagged if
+# it would use the heap on CircuitPython: container / string / closure / coroutine builds,
+# *args / **kwargs calls and definitions, a new GC object still alive after the opcode
+# (bound methods, iterators from C calls), allocating builtins, long ints (beyond the
+# 31-bit small ints) and raised exceptions. tools/stubs and this file stand in for the
+# firmware and the event loop, so their own allocations are not counted.
+
+ALLOC_OPCODES = {
+    "BUILD_TUPLE", "BUILD_LIST", "BUILD_SET", "BUILD_MAP", "BUILD_CONST_KEY_MAP",
+    "BUILD_STRING", "BUILD_SLICE", "FORMAT_VALUE", "LIST_EXTEND", "SET_UPDATE",
+    "DICT_UPDATE", "DICT_MERGE", "MAKE_FUNCTION", "MAKE_CELL", "CALL_FUNCTION_EX",
+    "RETURN_GENERATOR", "UNPACK_EX",
+}
+# CPython heap-allocates for-loop iterators; CircuitPython keeps them on the stack
+STACK_OPCODES = {"GET_ITER", "FOR_ITER"}
+ALLOC_BUILTINS = {
+    "enumerate", "zip", "map", "filter", "reversed", "sorted", "list", "dict", "tuple",
+    "set", "frozenset", "str", "repr", "format", "bytes", "bytearray", "memoryview",
+    "time_ns", "monotonic_ns", "str.join", "str.format", "str.split", "list.copy",
+    "dict.items", "dict.keys", "dict.values",
+}
+SMALL_INT = 1 << 30
+# ticks.py's fallback stands in for adafruit_ticks (supervisor.ticks_ms() on the board)
+HOST_ONLY = {os.path.join(ROOT, "ticks.py")}
+
+
+class HeapModel:
+    """
+    Flags what project code would allocate on CircuitPython while tracing is on
+    Provides:
+        - start() / stop() → install / remove the tracer
+        - resume() → call right before handing control back to project code
+        - take() → allocation sites since the last take(), {(file:line, reason): count}
+    """
+
+    def __init__(self, clock):
+        """
+        Args:
+            clock: The fake monotonic_ns - a project call to it is a long int on the board
+        """
+        self.clock = clock
+        self._ops = {}          # code object -> {offset: opname}
+        self._sites = {}
+        self._last = 0          # gc count after the previous project opcode
+        self._site = None       # previous project opcode, blamed for new GC objects
+        self._foreign = False   # foreign Python ran since then (its objects don't count)
+        self._tracer = self._local  # one bound method, so the tracer itself creates none
+
+    def _project(self, code):
+        filename = code.co_filename
+        return os.path.dirname(filename) == ROOT and filename not in HOST_ONLY
+
+    def _flag(self, frame, reason):
+        self._add(frame.f_code.co_filename, frame.f_lineno, reason)
+
+    def _add(self, filename, lineno, reason):
+        site = (f"{os.path.basename(filename)}:{lineno}", reason)
+        self._sites[site] = self._sites.get(site, 0) + 1
+
+    def _opname(self, frame):
+        code = frame.f_code
+        ops = self._ops.get(code)
+        if ops is None:
+            ops = {ins.offset: ins.opname for ins in dis.get_instructions(code)}
+            self._ops[code] = ops
+        return ops.get(frame.f_lasti, "?")
+
+    def _call(self, frame, event, arg):
+        if event != "call":
+            return None
+        code = frame.f_code
+        if not self._project(code):
+            self._foreign = True
+            if code is self.clock.__code__ and frame.f_back is not None \
+                    and self._project(frame.f_back.f_code):
+                self._flag(frame.f_back, "time.monotonic_ns() (long int)")
+            return None
+        if code.co_flags & (inspect.CO_VARARGS | inspect.CO_VARKEYWORDS):
+            self._flag(frame, "*args / **kwargs call")
+        frame.f_trace_lines = False
+        frame.f_trace_opcodes = True
+        self._last = gc.get_count()[0]  # ignore the frame CPython builds for the tracer
+        return self._tracer
+
+    def _local(self, frame, event, arg):
+        count = gc.get_count()[0]
+        if event == "opcode":
+            if self._site is not None and count > self._last and not self._foreign:
+                filename, lineno, prev_op = self._site
+                if prev_op not in STACK_OPCODES and prev_op not in ALLOC_OPCODES:
+                    self._add(filename, lineno, f"{prev_op} (new object)")
+            self._foreign = False
+            opname = self._opname(frame)
+            if opname in ALLOC_OPCODES:
+                self._flag(frame, opname)
+            # (no frame reference: keeping one alive makes CPython copy it out on return)
+            self._site = (frame.f_code.co_filename, frame.f_lineno, opname)
+        elif event == "return":
+            if type(arg) is int and not -SMALL_INT <= arg < SMALL_INT:
+                self._flag(frame, "long int")
+        elif event == "exception" and arg[0] is not StopIteration:
+            # (an await / iteration ending raises nothing on the board)
+            self._flag(frame, f"raise {arg[0].__name__}")
+        self._last = gc.get_count()[0]
+        return self._tracer
+
+    def _profile(self, frame, event, arg):
+        if event == "c_call":
+            # C calls are firmware; CPython's own temporaries there (vararg tuples
+            # going through free lists) are noise - only known allocators count
+            self._foreign = True
+            if self._project(frame.f_code):
+                name = getattr(arg, "__qualname__", getattr(arg, "__name__", ""))
+                if name in ALLOC_BUILTINS:
+                    self._flag(frame, f"{name}()")
+
+    def resume(self):
+        self._last = gc.get_count()[0]
+        self._site = None
+        self._foreign = False
+
+    def take(self):
+        sites = self._sites
+        self._sites = {}
+        return sites
+
+    def start(self):
+        gc.disable()  # counts only rise / fall with objects, never reset by a collection
+        sys.setprofile(self._profile)
+        sys.settrace(self._call)
+
+    def stop(self):
+        sys.settrace(None)
+        sys.setprofile(None)
+        gc.enable()
+
+
+class _Sleep:
+    """What CircuitPython's asyncio.sleep() returns: one reused SingletonGenerator"""
+
+    def __init__(self):
+        self.pending = False
+
+    def __await__(self):
+        self.pending = True
+        return self
+
+    def __next__(self):
+        if self.pending:
+            self.pending = False
+            return None  # back to the driver - one pass done for this task
+        raise StopIteration
+
+
+def setup_play_pass():
+    """A running Easy game as code.py wires it: game task + input / sensor / render tasks"""
+    import types
+    import board
+    import busio
+    import adafruit_displayio_ssd1306
+    import game_easy
+    import runtime
+    from accel_monitor import AccelMonitor
+    from adxl345_fake import FakeADXL345
+    from bus_arbiter import BusArbiter
+    from display_refresh import RefreshController
+    from input_events import InputManager
+    from rotary_encoder import RotaryEncoder
+
+    # The event loop is the driver here: every sleep hands control back to it
+    sleep = _Sleep()
+    loop = types.SimpleNamespace(sleep=lambda delay: sleep)
+    game_easy.asyncio = loop
+    runtime.asyncio = loop
+
+    i2c = busio.I2C()
+    display = adafruit_displayio_ssd1306.SSD1306(None, width=128, height=64)
+    arbiter = BusArbiter(i2c, sensor_hz=20)
+    refresher = RefreshController(display, target_fps=30, max_fps=33, arbiter=arbiter)
+    inputs = InputManager({"menu": board.D6, "jump": board.D1})
+    inputs.encoder = RotaryEncoder(board.D9, board.D8)
+    chip = FakeADXL345()
+    monitor = AccelMonitor(i2c, num_pixels=8, arbiter=arbiter, streaming=True,
+                           int_pin=chip.int1, accel_device=chip)
+    tasks = runtime.Runtime(inputs, refresher, monitor, input_hz=200, sensor_hz=20)
+    game = game_easy.run_game_async(display, inputs, monitor, "easy", refresher)
+    return game, [game, tasks.input_task(), tasks.sensor_task(), tasks.render_task()]
+
+
+def alloc_check(passes=3000, warmup=100, frame_ms=30):
+    """
+    Allocation sites hit during steady play-state passes (must be none)
+
+    One pass steps the game task and every Runtime task once, so it covers input polling,
+    physics, tile copies, the LED tick, display refresh and the bus arbiter. The lead bot
+    from headless_runner presses D1; passes that load a level, end one or run a transition
+    are not counted. Time is simulated, frame_ms per pass.
+    """
+    import board
+    import digitalio
+    import game_core
+    import game_easy
+    import runtime
+    from headless_runner import lead_policy
+
+    clock = [1 << 40]
+
+    def monotonic_ns():
+        return clock[0]
+
+    saved = (time.monotonic_ns, time.monotonic, game_easy.asyncio, runtime.asyncio)
+    time.monotonic_ns = monotonic_ns
+    time.monotonic = lambda: clock[0] / 1000000000
+    coros = []
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            game, coros = setup_play_pass()
+        jump = digitalio.PINS[board.D1]
+        bot = lead_policy(20)
+        model = HeapModel(monotonic_ns)
+
+        def play_state():
+            local = game.cr_frame.f_locals
+            state = local.get("state")  # None until the game has loaded its level
+            if state is None or local["phase"] != game_easy.PHASE_PLAY or \
+                    state.status != game_core.PLAYING:
+                return None
+            return state.level_index
+
+        measured = 0
+        sites = {}
+        for n in range(passes):
+            clock[0] += frame_ms * 1000000
+            before = play_state() if game.cr_frame else None
+            if before is not None:
+                jump.value = not bot(game.cr_frame.f_locals["state"])
+
+            model.start()
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    for coro in coros:
+                        model.resume()
+                        coro.send(None)
+            except StopIteration:
+                break  # the game finished
+            finally:
+                model.stop()
+
+            found = model.take()
+            if n >= warmup and before is not None and play_state() == before:
+                measured += 1
+                for site, count in found.items():
+                    sites[site] = sites.get(site, 0) + count
+    finally:
+        for coro in coros:
+            coro.close()
+        time.monotonic_ns, time.monotonic, game_easy.asyncio, runtime.asyncio = saved
+    return {"passes": measured, "sites": sites}
+
+
+def time_call(fn, calls, repeat):
+    """Best-of-repeat time per call, in microseconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(calls):
+            fn()
+        elapsed = time.perf_counter_ns() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best / calls / 1000
+
+
+def run(names=None, repeat=5, scale=1.0):
+    results = {}
+    for name, setup, calls in BENCHMARKS:
+        if names and name not in names:
+            continue
+        with contextlib.redirect_stdout(io.StringIO()):  # keep setup chatter out of the report
+            fn = setup()
+        calls = max(1, int(calls * scale))
+        fn()  # warm-up (first-use caches, lazy imports)
+        results[name] = {"us_per_call": time_call(fn, calls, repeat), "calls": calls}
+    return results
+
+
+def compare(results, baseline, threshold, limits):
+    """Returns a list of (name, ratio, limit) for every benchmark slower than its limit"""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        ratio = result["us_per_call"] / before["us_per_call"]
+        limit = limits.get(name, threshold)
+        result["baseline_us"] = before["us_per_call"]
+        result["ratio"] = ratio
+        if ratio > limit:
+            regressions.append((name, ratio, limit))
+    return regressions
+
+
+def parse_limits(items):
+    limits = {}
+    for item in items:
+        name, _, value = item.partition("=")
+        limits[name] = float(value)
+    return limits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host benchmarks against CircuitPython stubs")
+    parser.add_argument("names", nargs="*", help="Benchmarks to run (default: all)")
+    parser.add_argument("--out", help="Write results JSON here")
+    parser.add_argument("--baseline", help="Results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Slowdown ratio counted as a regression (default: 1.25)")
+    parser.add_argument("--limit", action="append", default=[], metavar="NAME=RATIO",
+                        help="Per-benchmark threshold, overrides --threshold")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark, best is kept")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every call count")
+    parser.add_argument("--list", action="store_true", help="List benchmarks and exit")
+    parser.add_argument("--alloc", action="store_true",
+                        help="Check that steady play-state passes allocate nothing, then exit")
+    args = parser.parse_args()
+
+    if args.alloc:
+        os.chdir(ROOT)
+        result = alloc_check()
+        sites = result["sites"]
+        print(f"play_pass: {result['passes']} steady passes (game, input, sensor, render tasks), "
+              f"{len(sites)} allocation sites")
+        for (where, reason), count in sorted(sites.items()):
+            print(f"  {where:<24} {reason} x{count}")
+        return 1 if sites or not result["passes"] else 0
+
+    if args.list:
+        for name, setup, calls in BENCHMARKS:
+            print(f"{name:<22} {calls:>6} calls  {(setup.__doc__ or '').strip()}")
+        return 0
+
+    os.chdir(ROOT)  # level pack / levels.json paths are relative to the project
+    results = run(args.names, args.repeat, args.scale)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold, parse_limits(args.limit))
+
+    for name, result in results.items():
+        line = f"{name:<22} {result['us_per_call']:>12.2f} us"
+        if "ratio" in result:
+            line += f"   baseline {result['baseline_us']:>10.2f} us   x{result['ratio']:.2f}"
+        print(line)
+
+    if args.out:
+        report = {
+            "python": sys.version.split()[0],
+            "platform": sys.platform,
+            "results": results,
+        }
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"Saved {args.out}")
+
+    for name, ratio, limit in regressions:
+        print(f"REGRESSION {name}: x{ratio:.2f} (limit x{limit:.2f})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+# difficulty_sweep.py
+# Monte Carlo clear-rate curves per level over a grid of speed multipliers and jump settings,
+# for choosing SPEED_MULTIPLIERS from data. Runs on a process pool; results are cached.
+#
+#   python3 tools/difficulty_sweep.py
+#   python3 tools/difficulty_sweep.py --multipliers 1.0,1.2,1.4,1.6,1.8 --players 5000
+#   python3 tools/difficulty_sweep.py --jump-heights 24,28 --jump-durations 30,40 --jobs 8
+#   python3 tools/difficulty_sweep.py --target medium=0.6 --target hard=0.3 --json curves.json
+#
+# Obstacles never react to the player (see solvability.py), so each (level, parameters) task
+# simulates its obstacle course once and then plays every simulated player against that table.
+# Cached rates are keyed by a hash of the level data, parameters and the physics sources, so a
+# rerun only computes what changed.
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+TOOLS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(TOOLS)
+sys.path.insert(0, ROOT)
+
+import game_core
+from obstacle_engine import FIX_SHIFT
+from solvability import player_step
+
+TICK_MS = 30
+MODEL_VERSION = 2   # bump when the player model below changes
+PHYSICS_SOURCES = ("game_core.py", "obstacle_engine.py", "collision.py", "jump_table.py",
+                   "sprite_patterns.py")
+DEFAULT_CACHE = os.path.join(TOOLS, "sweep_cache.json")
+
+
+# Simulated players
+
+def make_player(rng):
+    """
+    One player's timing: (bias_ms, spread_ms) of their jump relative to the ideal tick.
+    Positive bias = habitually late. Spread is how consistent they are.
+    """
+    return rng.gauss(0, 60), rng.uniform(20, 140)
+
+
+def obstacle_course(state, max_ticks=5000):
+    """
+    Run the level's obstacles alone
+
+    Returns:
+        (clear_tick, safe, threats) - safe[tick] holds the player y values that survive that
+        tick, threats[tick] is (slot, ticks until contact) of the nearest obstacle the player
+        has to jump, as seen before the tick (slot -1 when there is none)
+    """
+    engine = state.obstacles
+    ys = sorted(set(state.ground_y - lift for lift in state.jump_table))
+    player_x = state.player_x
+    safe = [None]
+    threats = [None]
+    cleared = 0
+    for tick in range(1, max_ticks + 1):
+        nearest = -1
+        contact = 0.0
+        for i in range(engine.count):
+            # Same collision band as headless_runner's bot: overhead obstacles, jumping
+            # or not, pass above a standing player
+            if engine.base_y[i] + engine.height <= state.ground_y:
+                continue
+            gap = engine.x_fp[i] - (player_x << FIX_SHIFT)  # both 1/256 px, like speed
+            if gap >= 0 and engine.speed[i] > 0 and (nearest < 0 or gap / engine.speed[i] < contact):
+                nearest = i
+                contact = gap / engine.speed[i]
+        threats.append((nearest, contact))
+
+        cleared += engine.step()
+        safe.append(frozenset(y for y in ys if not engine.hits(state.player_mask, player_x, y)))
+        if cleared >= state.active_count:
+            return tick, safe, threats
+    return None, safe, threats
+
+
+def clear_rate(level, settings, players, seed):
+    """Fraction of simulated players that clear one (already scaled) level"""
+    state = game_core.GameState([level], settings, 0)
+    duration = state.jump_duration
+    ground_y = state.ground_y
+    table = state.jump_table
+    clear_tick, safe, threats = obstacle_course(state)
+    if clear_tick is None:
+        return 0.0
+
+    rng = random.Random(seed)
+    ideal = duration / 2   # apex over the obstacle
+    cleared = 0
+    for _ in range(players):
+        bias, spread = make_player(rng)
+        timer = 0
+        target = None
+        threshold = 0.0
+        for tick in range(1, clear_tick + 1):
+            slot, contact = threats[tick]
+            press = False
+            if slot >= 0 and timer == 0:
+                if slot != target:
+                    # New obstacle: this attempt's error, in ticks (late presses wait longer)
+                    target = slot
+                    threshold = ideal - rng.gauss(bias, spread) / TICK_MS
+                press = contact <= threshold
+            timer, y = player_step(timer, press, duration, ground_y, table)
+            if y not in safe[tick]:
+                break
+        else:
+            cleared += 1
+    return cleared / players
+
+
+# Tasks and cache
+
+def physics_digest():
+    digest = hashlib.sha1(str(MODEL_VERSION).encode())
+    for name in PHYSICS_SOURCES:
+        with open(os.path.join(ROOT, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def scaled_level(level, multiplier, jump_height, jump_duration):
+    """Copy of a base (easy) level with speeds and jump settings applied"""
+    out = dict(level)
+    out['obstacles'] = [dict(obs, speed=obs.get('speed', 1.5) * multiplier)
+                        for obs in level['obstacles']]
+    if jump_height is not None:
+        out['jump_height'] = jump_height
+    if jump_duration is not None:
+        out['jump_duration'] = jump_duration
+    return out
+
+
+def task_key(level, settings, players, seed, digest):
+    blob = json.dumps([level, settings, players, seed, digest], sort_keys=True)
+    return hashlib.sha1(blob.encode()).hexdigest()
+
+
+def run_task(task):
+    key, level, settings, players, seed = task
+    return key, clear_rate(level, settings, players, seed)
+
+
+def load_cache(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(path, cache):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(cache, f)
+    os.replace(tmp, path)
+
+
+# Report
+
+def crossing(multipliers, rates, target):
+    """Multiplier where the mean clear rate falls to target (linear interpolation), or None"""
+    for i in range(1, len(multipliers)):
+        r0, r1 = rates[i - 1], rates[i]
+        if r0 >= target >= r1 and r0 != r1:
+            return multipliers[i - 1] + (multipliers[i] - multipliers[i - 1]) * (r0 - target) / (r0 - r1)
+    return None
+
+
+def parse_floats(text):
+    return [float(v) for v in text.split(",")] if text else []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel Monte Carlo difficulty sweep")
+    parser.add_argument("--levels", default=os.path.join(ROOT, "levels.json"))
+    parser.add_argument("--level", type=int, action="append", help="1-based level (repeatable; default: all)")
+    parser.add_argument("--multipliers", default="1.0,1.15,1.3,1.45,1.6,1.75,1.9")
+    parser.add_argument("--jump-heights", default="", help="Comma list (default: each level's own)")
+    parser.add_argument("--jump-durations", default="", help="Comma list (default: each level's own)")
+    parser.add_argument("--players", type=int, default=2000, help="Simulated players per cell")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help="Result cache ('' to disable)")
+    parser.add_argument("--target", action="append", default=[], metavar="NAME=RATE",
+                        help="Suggest the multiplier whose mean clear rate is RATE "
+                             "(default: medium=0.6, hard=0.4)")
+    parser.add_argument("--json", help="Write the curves here")
+    args = parser.parse_args()
+
+    levels, settings = game_core.load_levels("easy", args.levels)
+    indices = [n - 1 for n in args.level] if args.level else list(range(len(levels)))
+    multipliers = parse_floats(args.multipliers)
+    heights = [int(v) for v in parse_floats(args.jump_heights)] or [None]
+    durations = [int(v) for v in parse_floats(args.jump_durations)] or [None]
+    targets = [(name, float(rate)) for name, rate in (t.split("=") for t in args.target)] \
+        or [("medium", 0.6), ("hard", 0.4)]
+
+    digest = physics_digest()
+    cache = load_cache(args.cache) if args.cache else {}
+
+    # One task per (level, multiplier, jump_height, jump_duration)
+    cells = {}
+    todo = []
+    for jh in heights:
+        for jd in durations:
+            for index in indices:
+                for m in multipliers:
+                    level = scaled_level(levels[index], m, jh, jd)
+                    seed = args.seed * 1000003 + index
+                    key = task_key(level, settings, args.players, seed, digest)
+                    cells[(jh, jd, index, m)] = key
+                    if key not in cache:
+                        todo.append((key, level, settings, args.players, seed))
+
+    start = time.perf_counter()
+    if todo:
+        with multiprocessing.Pool(min(args.jobs, len(todo))) as pool:
+            for done, (key, rate) in enumerate(pool.imap_unordered(run_task, todo), 1):
+                cache[key] = rate
+                print(f"\r{done}/{len(todo)} cells", end="", file=sys.stderr)
+        print(file=sys.stderr)
+        if args.cache:
+            save_cache(args.cache, cache)
+    elapsed = time.perf_counter() - start
+    print(f"{len(cells)} cells, {len(todo)} computed ({len(cells) - len(todo)} cached), "
+          f"{len(todo) * args.players} sessions in {elapsed:.2f}s on {args.jobs} processes")
+
+    curves = []
+    for jh in heights:
+        for jd in durations:
+            label = f"jump_height={jh or 'level'} jump_duration={jd or 'level'}"
+            print(f"\nClear rate by speed multiplier ({label})")
+            print(f"{'':30}" + "".join(f"{m:>7.2f}" for m in multipliers))
+            per_level = {}
+            for index in indices:
+                rates = [cache[cells[(jh, jd, index, m)]] for m in multipliers]
+                per_level[levels[index]['level']] = rates
+                name = f"Lv{levels[index]['level']:>2} {levels[index]['name']}"
+                print(f"{name:<30}" + "".join(f"{r:>7.0%}" for r in rates))
+            mean = [sum(rates[i] for rates in per_level.values()) / len(per_level)
+                    for i in range(len(multipliers))]
+            print(f"{'mean':<30}" + "".join(f"{r:>7.0%}" for r in mean))
+
+            for name, rate in targets:
+                m = crossing(multipliers, mean, rate)
+                current = game_core.SPEED_MULTIPLIERS.get(name)
+                now = f" (currently {current})" if current is not None else ""
+                found = f"{m:.2f}" if m is not None else "outside the swept range"
+                print(f"  {name}: {rate:.0%} mean clear rate at multiplier {found}{now}")
+            curves.append({"jump_height": jh, "jump_duration": jd, "multipliers": multipliers,
+                           "levels": per_level, "mean": mean})
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"players": args.players, "seed": args.seed, "curves": curves}, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# headless_runner.py
+# Run full level sessions of game_core on a Linux host - no board/displayio needed.
+#
+#   python3 tools/headless_runner.py --difficulty hard --sessions 2000
+#   python3 tools/headless_runner.py --difficulty endless --endless-seed 42 --waves 40
+#   python3 tools/headless_runner.py --sessions 1 --record corpus   (replay corpus, tools/replay.py)
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import game_core
+from endless import EndlessLevels
+from input_recorder import InputRecorder
+from level_pack import load_level_pack
+
+
+def lead_policy(lead, jitter=0, rng=None):
+    """
+    Simple bot: press when the nearest obstacle ahead is `lead` pixels away
+
+    Args:
+        lead: Distance (pixels) between player and obstacle that triggers a jump
+        jitter: Random +/- pixels added to lead for every decision
+        rng: random.Random instance used for jitter
+    """
+    rng = rng or random.Random(0)
+
+    def policy(state):
+        player_x = state.player_x
+        obstacles = state.obstacles
+        nearest = None
+        for i in range(obstacles.count):
+            # Only obstacles whose resting rows reach a standing player are threats;
+            # overhead ones (jumping or not) pass above it - stay on the ground
+            if obstacles.base_y[i] + obstacles.height <= state.ground_y:
+                continue
+            gap = obstacles.x[i] - player_x
+            if gap >= 0 and (nearest is None or gap < nearest):
+                nearest = gap
+        if nearest is None:
+            return False
+        trigger = lead + (rng.uniform(-jitter, jitter) if jitter else 0)
+        return nearest <= trigger
+
+    return policy
+
+
+def run_session(levels, settings, level_index, policy, max_frames=10000, recorder=None):
+    """Play one level until it is cleared or lost. Returns (status, frames)"""
+    state = game_core.GameState(levels, settings, level_index)
+    step = game_core.step
+    playing = game_core.PLAYING
+    while state.frame < max_frames:
+        pressed = policy(state)
+        if recorder is not None:
+            recorder.record(pressed and not state.prev_button)
+        if step(state, pressed) != playing:
+            break
+    return state.status, state.frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless game_core level runner")
+    parser.add_argument("--difficulty", default="easy", choices=["easy", "medium", "hard", "endless"])
+    parser.add_argument("--levels", default=os.path.join(ROOT, "levels.json"))
+    parser.add_argument("--level", type=int, default=None, help="1-based level number (default: all)")
+    parser.add_argument("--sessions", type=int, default=1000, help="Sessions per level")
+    parser.add_argument("--lead", type=float, default=20.0)
+    parser.add_argument("--jitter", type=float, default=8.0)
+    parser.add_argument("--seed", type=int, default=1, help="Policy jitter seed")
+    parser.add_argument("--endless-seed", type=int, default=0, help="Wave generator seed (endless)")
+    parser.add_argument("--waves", type=int, default=20, help="Waves to run (endless)")
+    parser.add_argument("--record", metavar="DIR", help="Save each level's first session as a recording")
+    args = parser.parse_args()
+
+    if args.difficulty == "endless":
+        levels = EndlessLevels(args.endless_seed, args.levels)
+        settings = levels.settings
+        count = args.waves
+    else:
+        # The pack, like the board: speeds are stored in 1/256 px
+        levels, settings = load_level_pack(args.difficulty, args.levels,
+                                           os.path.join(ROOT, "levels.bin"))
+        count = len(levels)
+    indices = range(count) if args.level is None else [args.level - 1]
+    rng = random.Random(args.seed)
+    recorder = None
+    if args.record:
+        os.makedirs(args.record, exist_ok=True)
+        recorder = InputRecorder()
+
+    total_sessions = 0
+    total_frames = 0
+    start = time.perf_counter()
+    for index in indices:
+        cleared = 0
+        for session in range(args.sessions):
+            policy = lead_policy(args.lead, args.jitter, rng)
+            record = recorder if session == 0 else None
+            if record is not None:
+                record.start(args.difficulty, index, args.endless_seed)
+            status, frames = run_session(levels, settings, index, policy, recorder=record)
+            if record is not None:
+                record.save(os.path.join(args.record, f"{args.difficulty}_lv{index + 1:02}.sjr"))
+            cleared += status == game_core.LEVEL_CLEAR
+            total_frames += frames
+        total_sessions += args.sessions
+        print(f"Lv{levels[index]['level']:>2} {levels[index]['name']:<24} "
+              f"clear rate {cleared / args.sessions:6.1%}")
+    elapsed = time.perf_counter() - start
+
+    print(f"{total_sessions} sessions, {total_frames} frames in {elapsed:.2f}s "
+          f"({total_sessions / elapsed:.0f} sessions/s, {total_frames / elapsed:.0f} frames/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+# pickup_trace.py
+# Replay accelerometer traces through pickup_detector.PickupDetector on a host.
+#
+#   python3 tools/pickup_trace.py trace.csv --rate 100
+#   python3 tools/pickup_trace.py --synth synth.csv && python3 tools/pickup_trace.py synth.csv
+#   python3 tools/pickup_trace.py trace.csv --on-rms 0.8 --off-rms 0.3 --window-ms 300
+#   python3 tools/pickup_trace.py trace.csv --bus      (I2C transactions: polling vs FIFO streaming)
+#
+# A trace is CSV, one sample per line: x,y,z in m/s^2 and an optional 4th column, 1 while
+# the device was really being handled (used to score the detector). Record one from the board
+# with accel_monitor.py's standalone test and PRINT_TRACE = True.
+import argparse
+import csv
+import math
+import os
+import random
+import sys
+
+TOOLS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(TOOLS)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(TOOLS, "stubs"))  # board, neopixel, ... for AccelMonitor (--bus)
+
+from pickup_detector import PickupDetector
+
+GRAVITY = 9.80665
+
+
+def old_rule(x, y, z):
+    """The check AccelMonitor used before the detector (kept for comparison)"""
+    return (x * x + y * y + z * z) ** 0.5 > 8 or z > 8
+
+
+def load_trace(path):
+    """Returns (samples, labels); labels is None when the trace has no 4th column"""
+    samples = []
+    labels = []
+    with open(path, newline="") as f:
+        for row in csv.reader(f):
+            try:
+                values = [float(v) for v in row]
+            except ValueError:
+                continue  # header / comment
+            if len(values) < 3:
+                continue
+            samples.append((values[0], values[1], values[2]))
+            labels.append(bool(values[3]) if len(values) > 3 else None)
+    if any(label is None for label in labels):
+        labels = None
+    return samples, labels
+
+
+def synth_trace(rate, seed=1):
+    """
+    Labelled test trace: rest, desk knocks, a pickup with hand tremor and a new tilt,
+    set down at a different resting angle, rest
+    """
+    rng = random.Random(seed)
+    out = []
+
+    def gravity(tilt_deg):
+        t = math.radians(tilt_deg)
+        return 0.0, GRAVITY * math.sin(t), GRAVITY * math.cos(t)
+
+    def emit(seconds, tilt_from, tilt_to, handled, tremor=0.0, extra=None):
+        n = int(seconds * rate)
+        for i in range(n):
+            t = i / rate
+            gx, gy, gz = gravity(tilt_from + (tilt_to - tilt_from) * i / max(1, n - 1))
+            sample = [gx, gy, gz]
+            for axis in range(3):
+                sample[axis] += rng.gauss(0, 0.04)                    # sensor noise
+                if tremor:
+                    sample[axis] += tremor * math.sin(2 * math.pi * 8 * t + axis) \
+                        + rng.gauss(0, tremor / 2)                    # hand tremor
+            if extra:
+                extra(t, sample)
+            out.append((sample[0], sample[1], sample[2], 1 if handled else 0))
+
+    def knock(t, sample):
+        # Desk knocks: short decaying 0.3 m/s^2 rings twice a second
+        phase = t % 0.5
+        sample[2] += 0.3 * math.exp(-phase * 40) * math.sin(2 * math.pi * 30 * phase)
+
+    def lift(t, sample):
+        sample[2] += 3.0 * math.sin(math.pi * min(t / 0.4, 1.0))
+
+    emit(3.0, 0, 0, False)
+    emit(2.0, 0, 0, False, extra=knock)
+    emit(0.5, 0, 40, True, tremor=0.5, extra=lift)   # lift and turn towards the face
+    emit(2.5, 40, 40, True, tremor=0.5)              # held
+    emit(0.5, 40, 10, True, tremor=0.5)              # put down
+    emit(3.0, 10, 10, False)                         # resting on a tilt
+    return out
+
+
+def intervals(flags, rate):
+    """[(start_s, end_s)] runs of True"""
+    runs = []
+    start = None
+    for i, flag in enumerate(flags):
+        if flag and start is None:
+            start = i
+        elif not flag and start is not None:
+            runs.append((start / rate, i / rate))
+            start = None
+    if start is not None:
+        runs.append((start / rate, len(flags) / rate))
+    return runs
+
+
+def score(name, flags, labels):
+    rest = [f for f, label in zip(flags, labels) if not label]
+    held = [f for f, label in zip(flags, labels) if label]
+    rest_rate = sum(rest) / len(rest) if rest else 0.0
+    held_rate = sum(held) / len(held) if held else 0.0
+    print(f"  {name:<9} flagged {held_rate:6.1%} of handled samples, {rest_rate:6.1%} at rest")
+
+
+def bus_check(samples, labels, rate, poll_hz=20):
+    """
+    Run the trace through AccelMonitor's sensor reads at the runtime's poll rate and count
+    I2C transactions: polling (one 6-byte read per poll) against FIFO streaming on a
+    FakeADXL345 sampling the trace at its own output rate, with and without INT1 wired
+    """
+    import contextlib
+    import io
+    import busio
+    from accel_monitor import AccelMonitor
+    from adxl345_fake import FakeADXL345
+
+    duration = len(samples) / rate
+    polls = int(duration * poll_hz)
+    print(f"  bus: {polls} polls at {poll_hz} Hz")
+    for name in ("polling", "streaming", "stream+INT1"):
+        with contextlib.redirect_stdout(io.StringIO()):
+            if name == "polling":
+                chip = None
+                monitor = AccelMonitor(busio.I2C(), num_pixels=8, sample_hz=poll_hz)
+            else:
+                chip = FakeADXL345()
+                monitor = AccelMonitor(busio.I2C(), num_pixels=8, streaming=True, accel_device=chip,
+                                       int_pin=chip.int1 if name == "stream+INT1" else None)
+        stream = monitor.stream
+        setup = chip.transactions if chip else 0
+        pushed = 0
+        spent = {False: 0, True: 0}   # transactions by label (handled?) at the poll
+        polled = {False: 0, True: 0}
+        for k in range(polls):
+            t = k / poll_hz
+            index = min(len(samples) - 1, int(t * rate))
+            before = chip.transactions if chip else 0
+            if chip is None:
+                monitor.accel.acceleration = samples[index]
+                monitor.check_pickup()
+                used = 1
+            else:
+                # The chip samples on its own clock; catch it up to this poll
+                while pushed / stream.sample_hz <= t:
+                    chip.push(*samples[min(len(samples) - 1, int(pushed / stream.sample_hz * rate))])
+                    pushed += 1
+                monitor.check_pickup()
+                used = chip.transactions - before
+            label = bool(labels[index]) if labels is not None else False
+            spent[label] += used
+            polled[label] += 1
+        total = spent[False] + spent[True]
+        rates = ", ".join(f"{spent[h] * poll_hz / polled[h]:.1f}/s {what}"
+                          for h, what in ((False, "at rest"), (True, "handled")) if polled[h])
+        print(f"  {name:<12} {total:>5} transactions ({rates}), "
+              f"{monitor.detector.pickups} pickups" + (f", setup {setup}" if chip else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay accelerometer traces through PickupDetector")
+    parser.add_argument("traces", nargs="*", help="CSV traces (x,y,z[,handled])")
+    parser.add_argument("--rate", type=float, default=100, help="Trace sample rate, Hz (default: 100)")
+    parser.add_argument("--cutoff", type=float, default=0.5, help="High-pass corner, Hz")
+    parser.add_argument("--window-ms", type=int, default=200)
+    parser.add_argument("--on-rms", type=float, default=1.0)
+    parser.add_argument("--off-rms", type=float, default=0.4)
+    parser.add_argument("--batch", type=int, default=1, help="Samples per feed_many() call")
+    parser.add_argument("--synth", metavar="PATH", help="Write a labelled synthetic trace and exit")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--bus", action="store_true",
+                        help="Also count I2C transactions: polling vs FIFO streaming (FakeADXL345)")
+    args = parser.parse_args()
+
+    if args.synth:
+        rows = synth_trace(args.rate, args.seed)
+        with open(args.synth, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["x", "y", "z", "handled"])
+            for x, y, z, handled in rows:
+                writer.writerow([f"{x:.4f}", f"{y:.4f}", f"{z:.4f}", handled])
+        print(f"Wrote {len(rows)} samples ({len(rows) / args.rate:.1f} s at {args.rate:g} Hz) "
+              f"to {args.synth}")
+        return 0
+    if not args.traces:
+        parser.error("no traces given")
+
+    for path in args.traces:
+        samples, labels = load_trace(path)
+        detector = PickupDetector(sample_hz=args.rate, cutoff_hz=args.cutoff,
+                                  window_ms=args.window_ms, on_rms=args.on_rms, off_rms=args.off_rms)
+        flags = []
+        for i in range(0, len(samples), args.batch):
+            batch = samples[i:i + args.batch]
+            if args.batch == 1:
+                detector.feed(*batch[0])
+                flags.append(detector.picked_up)
+            else:
+                flags.extend([detector.feed_many(batch)] * len(batch))
+        old = [old_rule(x, y, z) for x, y, z in samples]
+
+        print(f"{os.path.basename(path)}: {len(samples)} samples, {len(samples) / args.rate:.1f} s, "
+              f"{detector.pickups} pickups")
+        for start, end in intervals(flags, args.rate):
+            print(f"  picked up {start:6.2f}s - {end:6.2f}s")
+        if labels is not None:
+            score("detector", flags, labels)
+            score("old rule", old, labels)
+        if args.bus:
+            bus_check(samples, labels, args.rate)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+# replay.py
+# Replay input recordings (input_recorder.py) through game_core at uncapped speed.
+#
+#   python3 tools/replay.py replay.sjr
+#   python3 tools/replay.py --hex 534a523101...            (log printed over serial)
+#   python3 tools/replay.py corpus/*.sjr --expect corpus/expected.json [--update]
+#
+# Obstacles move in fixed point (1/256 px), so a device log replays here bit for bit.
+# Every recording is also replayed with its levels' x / speed values stored as
+# array('f') and array('d') floats; a different result under the two fails the run.
+import argparse
+import binascii
+import json
+import os
+import sys
+import time
+from array import array
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from input_recorder import Recording, replay
+
+
+class StoredAs:
+    """Level source whose obstacle x / speed values round-trip through array(typecode)"""
+
+    def __init__(self, levels, typecode):
+        self.levels = levels
+        self.typecode = typecode
+        self.max_obstacles = getattr(levels, 'max_obstacles', None)
+
+    def __len__(self):
+        return len(self.levels)
+
+    def __getitem__(self, i):
+        level = dict(self.levels[i])
+        obstacles = []
+        for obs in level['obstacles']:
+            obs = dict(obs)
+            obs['x'] = array(self.typecode, [obs['x']])[0]
+            obs['speed'] = array(self.typecode, [obs.get('speed', 1.5)])[0]
+            obstacles.append(obs)
+        level['obstacles'] = obstacles
+        return level
+
+
+def precision_check(recording, levels, settings):
+    """Events under single- and double-precision level values, or None if they agree"""
+    single = replay(recording, StoredAs(levels, 'f'), settings)
+    double = replay(recording, StoredAs(levels, 'd'), settings)
+    return None if single == double else (single, double)
+
+
+def run_one(name, recording, json_path, quiet=False):
+    """Replay one recording, print its events and return them (None if precision-dependent)"""
+    levels, settings = recording.load_levels(json_path, os.path.join(ROOT, "levels.bin"))
+    start = time.perf_counter()
+    events = replay(recording, levels, settings)
+    elapsed = time.perf_counter() - start
+
+    mismatch = precision_check(recording, levels, settings)
+    if mismatch is not None:
+        single, double = mismatch
+        end_single = single[-1][0] if single else None
+        end_double = double[-1][0] if double else None
+        print(f"PRECISION {name}: last event at tick {end_single} ('f') vs {end_double} ('d')")
+        return None
+
+    seed = f" seed {recording.seed}" if recording.difficulty == "endless" else ""
+    print(f"{name}: {recording.difficulty}{seed}, from level {recording.level_index + 1}, "
+          f"{recording.ticks} ticks in {elapsed * 1000:.1f} ms "
+          f"({recording.ticks / elapsed:.0f} ticks/s)")
+    if not quiet:
+        for tick, kind, level in events:
+            print(f"  tick {tick:>6}  Lv{level:>2}  {kind}")
+    return [list(event) for event in events]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay bit-packed input recordings")
+    parser.add_argument("files", nargs="*", help="Recordings (.sjr)")
+    parser.add_argument("--hex", action="append", default=[], help="Recording as a hex string")
+    parser.add_argument("--levels", default=os.path.join(ROOT, "levels.json"))
+    parser.add_argument("--expect", help="JSON of expected events per recording (regression check)")
+    parser.add_argument("--update", action="store_true", help="Rewrite --expect from this run")
+    parser.add_argument("--quiet", action="store_true", help="Summaries only")
+    args = parser.parse_args()
+
+    inputs = [(os.path.basename(path), Recording.load(path)) for path in args.files]
+    for i, text in enumerate(args.hex):
+        inputs.append((f"hex{i + 1}", Recording(binascii.unhexlify(text.strip()))))
+    if not inputs:
+        parser.error("no recordings given")
+
+    results = {name: run_one(name, recording, args.levels, args.quiet) for name, recording in inputs}
+    unstable = [name for name, events in results.items() if events is None]
+    if unstable:
+        print(f"{len(unstable)}/{len(results)} recordings depend on float precision")
+        return 1
+
+    if not args.expect:
+        return 0
+    if args.update:
+        with open(args.expect, "w") as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+        print(f"Wrote {len(results)} expectations to {args.expect}")
+        return 0
+
+    with open(args.expect) as f:
+        expected = json.load(f)
+    failed = 0
+    for name, events in results.items():
+        if name not in expected:
+            print(f"NEW   {name} (no expectation, run with --update)")
+        elif expected[name] != events:
+            failed += 1
+            print(f"DIFF  {name}: expected {len(expected[name])} events, got {len(events)}")
+            for want, got in zip(expected[name], events):
+                if want != got:
+                    print(f"      first difference: expected {want}, got {got}")
+                    break
+    print(f"{len(results) - failed}/{len(results)} recordings match")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+# solvability.py
+# Prove each level clearable (or not) under the game's own rules, and find its tightest jump timing.
+#
+#   python3 tools/solvability.py                       (every level, easy / medium / hard)
+#   python3 tools/solvability.py --difficulty hard --level 10 --witness
+#   python3 tools/solvability.py --difficulty endless --endless-seed 42 --waves 40
+#
+# Obstacles never react to the player, so their positions (and the tick the level clears on)
+# depend on the tick alone. That collapses the game state to (tick, player jump timer): the
+# obstacles are simulated once with game_core's ObstacleEngine and sprite masks, and the jump
+# decisions are solved over that small table in one backward pass instead of enumerating
+# inputs (iterative, so long levels and slow endless waves never hit the recursion limit).
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import game_core
+from endless import EndlessLevels
+from level_pack import load_level_pack
+
+TICK_MS = 30  # game_easy's physics tick
+
+
+def obstacle_course(state, max_ticks=10000):
+    """
+    Run the level's obstacles alone
+
+    Returns:
+        (clear_tick, safe) - safe[tick] is the set of player y values that do not
+        collide after that tick's step; clear_tick is None if the level never clears
+    """
+    engine = state.obstacles
+    ys = sorted(set(state.ground_y - lift for lift in state.jump_table))
+    safe = [None]  # ticks are 1-based, like state.frame
+    cleared = 0
+    for tick in range(1, max_ticks + 1):
+        cleared += engine.step()
+        safe.append(frozenset(y for y in ys
+                              if not engine.hits(state.player_mask, state.player_x, y)))
+        if cleared >= state.active_count:
+            return tick, safe
+    return None, safe
+
+
+def player_step(timer, press, duration, ground_y, table):
+    """game_core.step()'s jump rules on a bare timer (0 = on the ground). Returns (timer, y)"""
+    if press and timer == 0:
+        timer = duration
+    if timer == 0:
+        return 0, ground_y
+    y = ground_y - table[timer]
+    timer -= 1
+    return timer, ground_y if timer == 0 else y
+
+
+def analyze(levels, settings, index):
+    """
+    Search one level's jump decisions
+
+    Returns a dict with solvable, clear_tick, dead_tick (first tick nothing survives),
+    windows [(first, last) ticks in which a jump must start - last is the deadline after
+    which waiting loses] and witness (jump ticks of one winning run)
+    """
+    state = game_core.GameState(levels, settings, index)
+    duration = state.jump_duration
+    ground_y = state.ground_y
+    table = state.jump_table
+    clear_tick, safe = obstacle_course(state)
+    horizon = clear_tick if clear_tick is not None else len(safe) - 1
+
+    # wins[tick][timer] - can the level still be cleared entering `tick` in that phase.
+    # Filled backwards from the clear tick; each row only reads the one after it.
+    wins = [None] * (horizon + 2)
+    if clear_tick is not None:
+        wins[horizon + 1] = bytearray(duration + 1)  # past the clear - never read
+        for tick in range(horizon, 0, -1):
+            row = bytearray(duration + 1)
+            following = wins[tick + 1]
+            allowed = safe[tick]
+            for timer in range(duration + 1):
+                for press in ((False, True) if timer == 0 else (False,)):
+                    next_timer, y = player_step(timer, press, duration, ground_y, table)
+                    if y in allowed and (tick == clear_tick or following[next_timer]):
+                        row[timer] = 1
+                        break
+            wins[tick] = row
+
+    # Forward over reachable phases, keeping only moves that stay winnable
+    result = {"solvable": False, "clear_tick": clear_tick, "dead_tick": None,
+              "windows": [], "witness": []}
+    reachable = {0: None}
+    parents = [None, reachable]
+    jump_ticks = []
+    deadlines = []
+    for tick in range(1, horizon + 1):
+        following = {}
+        for timer in reachable:
+            waiting_wins = False
+            for press in ((False, True) if timer == 0 else (False,)):
+                next_timer, y = player_step(timer, press, duration, ground_y, table)
+                if y not in safe[tick]:
+                    continue
+                winning = clear_tick is not None and (tick == clear_tick or
+                                                      wins[tick + 1][next_timer] == 1)
+                if not press:
+                    waiting_wins = winning
+                elif winning:
+                    jump_ticks.append(tick)
+                    if not waiting_wins:
+                        deadlines.append(tick)
+                if next_timer not in following or winning:
+                    following[next_timer] = (timer, press, winning)
+        if not following:
+            result["dead_tick"] = tick
+            return result
+        reachable = following
+        parents.append(reachable)
+
+    if clear_tick is None:
+        return result
+    result["solvable"] = any(link[2] for link in reachable.values())
+    if not result["solvable"]:
+        return result
+
+    # Windows: the run of consecutive winning jump ticks leading up to each deadline
+    jump_set = set(jump_ticks)
+    for deadline in deadlines:
+        first = deadline
+        while first - 1 in jump_set:
+            first -= 1
+        result["windows"].append((first, deadline))
+
+    # Witness: walk one winning path back from the clear tick
+    timer = next(t for t, link in reachable.items() if link[2])
+    for tick in range(horizon, 0, -1):
+        previous, press, _ = parents[tick + 1][timer]
+        if press:
+            result["witness"].append(tick)
+        timer = previous
+    result["witness"].reverse()
+    return result
+
+
+def report(difficulty, levels, settings, indices, witness=False):
+    """Analyze and print each level. Returns how many were unsolvable"""
+    unsolvable = 0
+    for index in indices:
+        level = levels[index]
+        start = time.perf_counter()
+        result = analyze(levels, settings, index)
+        elapsed = (time.perf_counter() - start) * 1000
+        name = f"{difficulty:<7} Lv{level['level']:>2} {level['name']:<24}"
+        if result["solvable"] and not result["windows"]:
+            print(f"{name} solvable    clears at tick {result['clear_tick']:>4}, "
+                  f"no jump needed  [{elapsed:.0f} ms]")
+        elif result["solvable"]:
+            first, last = min(result["windows"], key=lambda w: w[1] - w[0])
+            width = last - first + 1
+            print(f"{name} solvable    clears at tick {result['clear_tick']:>4}, tightest window "
+                  f"{width:>2} ticks ({width * TICK_MS} ms) at tick {first}-{last}  "
+                  f"[{elapsed:.0f} ms]")
+            if witness:
+                print(f"{'':36}jump at ticks {result['witness']}")
+        else:
+            unsolvable += 1
+            if result["clear_tick"] is None:
+                why = "never clears"
+            elif result["dead_tick"] is not None:
+                why = f"no safe move at tick {result['dead_tick']}"
+            else:
+                why = "no winning path"
+            print(f"{name} UNSOLVABLE  {why}  [{elapsed:.0f} ms]")
+    return unsolvable
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Level solvability analyzer")
+    parser.add_argument("--difficulty", action="append",
+                        choices=["easy", "medium", "hard", "endless"],
+                        help="Difficulty to check (repeatable; default: easy, medium, hard)")
+    parser.add_argument("--levels", default=os.path.join(ROOT, "levels.json"))
+    parser.add_argument("--level", type=int, default=None, help="1-based level number (default: all)")
+    parser.add_argument("--endless-seed", type=int, default=0, help="Wave generator seed (endless)")
+    parser.add_argument("--waves", type=int, default=30, help="Waves to check (endless)")
+    parser.add_argument("--witness", action="store_true", help="Print one winning jump sequence")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    unsolvable = 0
+    checked = 0
+    for difficulty in args.difficulty or ["easy", "medium", "hard"]:
+        if difficulty == "endless":
+            levels = EndlessLevels(args.endless_seed, args.levels)
+            settings = levels.settings
+            count = args.waves
+        else:
+            # The pack, like the board: speeds are stored in 1/256 px
+            levels, settings = load_level_pack(difficulty, args.levels,
+                                               os.path.join(ROOT, "levels.bin"))
+            count = len(levels)
+        indices = range(count) if args.level is None else [args.level - 1]
+        unsolvable += report(difficulty, levels, settings, indices, args.witness)
+        checked += len(indices)
+
+    print(f"{checked - unsolvable}/{checked} solvable in {time.perf_counter() - start:.2f}s")
+    return 1 if unsolvable else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,8 @@
+# adafruit_adxl34x.py (host stub)
+# acceleration is a plain attribute: set it to feed samples, default is resting flat.
+
+
+class ADXL345:
+    def __init__(self, i2c, address=0x53):
+        self.address = address
+        self.acceleration = (0.0, 0.0, 9.8)
@@ -0,0 +1,21 @@
+# adafruit_display_text/bitmap_label.py (host stub)
+# The real Label renders its text into one Bitmap at construction / text change.
+import displayio
+
+
+class Label(displayio.Group):
+    def __init__(self, font, *, text="", color=0xFFFFFF, x=0, y=0, **kwargs):
+        super().__init__(x=x, y=y)
+        self.font = font
+        self.color = color
+        self._text = text
+        self.renders = 1
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        self._text = value
+        self.renders += 1
@@ -0,0 +1,11 @@
+# adafruit_display_text/label.py (host stub)
+
+
+class Label:
+    def __init__(self, font, *, text="", color=0xFFFFFF, x=0, y=0, **kwargs):
+        self.font = font
+        self.text = text
+        self.color = color
+        self.x = x
+        self.y = y
+        self.hidden = False
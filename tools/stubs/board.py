@@ -0,0 +1,15 @@
+# board.py (host stub)
+# Pin names are plain integers so digitalio.PINS can be looked up by them.
+D1 = 1
+D6 = 6
+D7 = 7
+D8 = 8
+D9 = 9
+D10 = 10
+SCL = 20
+SDA = 21
+
+
+def I2C():
+    import busio
+    return busio.I2C(SCL, SDA)
@@ -0,0 +1,15 @@
+# busio.py (host stub)
+
+
+class I2C:
+    def __init__(self, scl=None, sda=None, frequency=400000):
+        self.frequency = frequency
+
+    def try_lock(self):
+        return True
+
+    def unlock(self):
+        pass
+
+    def deinit(self):
+        pass
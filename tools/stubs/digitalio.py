@@ -0,0 +1,35 @@
+# digitalio.py (host stub)
+# Every DigitalInOut registers itself in PINS so tools can drive inputs by pin.
+
+
+class Pull:
+    UP = 1
+    DOWN = 2
+
+
+class Direction:
+    INPUT = 0
+    OUTPUT = 1
+
+
+PINS = {}
+
+
+class DigitalInOut:
+    def __init__(self, pin):
+        self.pin = pin
+        self.value = True
+        self.direction = Direction.INPUT
+        self.pull = None
+        PINS[pin] = self
+
+    def switch_to_input(self, pull=None):
+        self.direction = Direction.INPUT
+        self.pull = pull
+
+    def switch_to_output(self, value=False):
+        self.direction = Direction.OUTPUT
+        self.value = value
+
+    def deinit(self):
+        PINS.pop(self.pin, None)
@@ -0,0 +1,44 @@
+# displayio.py (host stub)
+
+
+class Group(list):
+    def __init__(self, *, scale=1, x=0, y=0):
+        super().__init__()
+        self.scale = scale
+        self.x = x
+        self.y = y
+        self.hidden = False
+
+
+class Bitmap:
+    def __init__(self, width, height, value_count):
+        self.width = width
+        self.height = height
+        self._data = bytearray(width * height)
+
+    def __setitem__(self, xy, value):
+        self._data[xy[1] * self.width + xy[0]] = value
+
+    def __getitem__(self, xy):
+        return self._data[xy[1] * self.width + xy[0]]
+
+
+class Palette(list):
+    def __init__(self, color_count):
+        super().__init__([0] * color_count)
+
+    def make_transparent(self, index):
+        pass
+
+
+class TileGrid:
+    def __init__(self, bitmap, *, pixel_shader=None, x=0, y=0, **kwargs):
+        self.bitmap = bitmap
+        self.pixel_shader = pixel_shader
+        self.x = x
+        self.y = y
+        self.hidden = False
+
+
+def release_displays():
+    pass
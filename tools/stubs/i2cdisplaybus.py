@@ -0,0 +1,6 @@
+# i2cdisplaybus.py (host stub)
+
+
+class I2CDisplayBus:
+    def __init__(self, i2c_bus, *, device_address=0x3C, **kwargs):
+        self.device_address = device_address
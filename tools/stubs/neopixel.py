@@ -0,0 +1,21 @@
+# neopixel.py (host stub)
+# shows counts show() calls - each one is a full strip write on the device.
+
+
+class NeoPixel(list):
+    def __init__(self, pin, n, *, brightness=1.0, auto_write=True, pixel_order=None):
+        super().__init__([(0, 0, 0)] * n)
+        self.n = n
+        self.brightness = brightness
+        self.auto_write = auto_write
+        self.shows = 0
+
+    def fill(self, color):
+        for i in range(self.n):
+            self[i] = color
+
+    def show(self):
+        self.shows += 1
+
+    def deinit(self):
+        pass
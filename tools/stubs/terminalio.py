@@ -0,0 +1,2 @@
+# terminalio.py (host stub)
+FONT = None